@@ -12,8 +12,8 @@ from imbie2.const.error_methods import ErrorMethod
 from imbie2.const.table_formats import TableFormat
 from imbie2.const.lsq_methods import LSQMethod
 
-import matplotlib.pyplot as plt
-format_opts = list(plt.gcf().canvas.get_supported_filetypes().keys())
+from matplotlib.backend_bases import FigureCanvasBase
+format_opts = list(FigureCanvasBase.get_supported_filetypes().keys())
 
 
 class ConfigFile:
@@ -80,6 +80,7 @@ class ImbieConfig(ConfigFile):
     methods_skip = ConfigParam("methods_skip", Group, multiple=True)
     users_skip = ConfigParam("users_skip", str, multiple=True)
     users_mark = ConfigParam("users_mark", str, multiple=True)
+    print_marked = ConfigParam("print_marked", bool, default=True)
 
     combine_method = ConfigParam("combine_method", AverageMethod, default=AverageMethod.equal_groups)
     group_avg_errors_method = ConfigParam("group_avg_error_method", ErrorMethod, optional=True)
@@ -88,8 +89,10 @@ class ImbieConfig(ConfigFile):
 
     align_date = ConfigParam("align_date", float, optional=True)
     average_nsigma = ConfigParam("average_nsigma", float, optional=True)
+    average_workers = ConfigParam("average_workers", int, optional=True)
     plot_smooth_window = ConfigParam("plot_smooth_window", float, optional=True)
     plot_smooth_iters = ConfigParam("plot_smooth_iters", int, optional=True)
+    plot_workers = ConfigParam("plot_workers", int, optional=True)
 
     export_data = ConfigParam("export_data", bool, default=False)
     include_la = ConfigParam("enable_la_group", bool, default=False)
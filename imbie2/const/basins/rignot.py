@@ -1,5 +1,7 @@
 import enum
 from .sheets import IceSheet
+from functools import lru_cache
+from typing import Tuple
 
 
 class RignotBasin(enum.Enum):
@@ -10,7 +12,13 @@ class RignotBasin(enum.Enum):
         return cls(value)
 
     @classmethod
-    def sheet(cls, sheet: IceSheet) -> "RignotBasin":
+    @lru_cache(maxsize=None)
+    def sheet(cls, sheet: IceSheet) -> Tuple["RignotBasin", ...]:
+        """
+        returns the basins which make up the ice sheet 'sheet'.
+
+        The result is cached, so it is returned as an immutable tuple.
+        """
         sheets = {
             cls.rK_A: IceSheet.eais,
             cls.rA_Ap: IceSheet.eais,
@@ -39,11 +47,13 @@ class RignotBasin(enum.Enum):
         }
 
         ais = [IceSheet.apis, IceSheet.wais, IceSheet.eais]
+        basins = []
         for basin in cls:
             if sheets[basin] == sheet:
-                yield basin
+                basins.append(basin)
             elif sheets[basin] in ais and sheet == IceSheet.ais:
-                yield basin
+                basins.append(basin)
+        return tuple(basins)
     # antarctica basins:
     rK_A = "K-A"
     rA_Ap = "A-AP"
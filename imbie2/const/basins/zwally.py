@@ -1,5 +1,7 @@
 from .sheets import IceSheet
 import enum
+from functools import lru_cache
+from typing import Tuple
 
 
 class ZwallyBasin(enum.Enum):
@@ -11,7 +13,13 @@ class ZwallyBasin(enum.Enum):
         return cls(value)
 
     @classmethod
-    def sheet(cls, sheet: IceSheet) -> "ZwallyBasin":
+    @lru_cache(maxsize=None)
+    def sheet(cls, sheet: IceSheet) -> Tuple["ZwallyBasin", ...]:
+        """
+        returns the basins which make up the ice sheet 'sheet'.
+
+        The result is cached, so it is returned as an immutable tuple.
+        """
         sheets = {
             cls.z01: IceSheet.wais,
             cls.z02: IceSheet.eais,
@@ -61,11 +69,13 @@ class ZwallyBasin(enum.Enum):
             cls.z8_2: IceSheet.gris
         }
         ais = [IceSheet.apis, IceSheet.wais, IceSheet.eais]
+        basins = []
         for basin in cls:
             if sheets[basin] == sheet:
-                yield basin
+                basins.append(basin)
             elif sheets[basin] in ais and sheet == IceSheet.ais:
-                yield basin
+                basins.append(basin)
+        return tuple(basins)
 
     # antarctica basins:
     z01 = "01"
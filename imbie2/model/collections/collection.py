@@ -1,4 +1,5 @@
 from abc import ABCMeta, abstractmethod
+from collections import defaultdict
 from typing import Sequence, Iterable, Union
 
 from imbie2.model.series import *
@@ -51,23 +52,34 @@ class Collection(metaclass=ABCMeta):
     def add_series(self, series: Series) -> None:
         self.series.append(series)
 
+    def extend(self, series: Iterable[Series]) -> None:
+        """
+        adds several series to the collection at once
+        """
+        self.series.extend(series)
+
     def merge(self) -> None:
+        # only series with the same user, group & basin can be merged, so
+        # find the candidates for each series in a single pass
+        candidates = defaultdict(list)
+        for s in self:
+            candidates[s.user, s.user_group, s.basin_id].append(s)
+
         rem = []
+        removed = set()
         new = []
         for a in self:
-            if a in rem:
+            if id(a) in removed:
                 continue
-            for b in self:
-                if b in rem:
+            for b in candidates[a.user, a.user_group, a.basin_id]:
+                if id(b) in removed:
                     continue
-                if a.user == b.user and\
-                   a.user_group == b.user_group and\
-                   a.basin_id == b.basin_id and\
-                   a.basin_group != b.basin_group:
+                if a.basin_group != b.basin_group:
                     s = b.merge(b, a)
                     if s is not None:
                         rem.append(a)
                         rem.append(b)
+                        removed.update((id(a), id(b)))
                         new.append(s)
         for s in rem:
             self.series.remove(s)
@@ -75,6 +87,11 @@ class Collection(metaclass=ABCMeta):
             self.series.append(s)
 
     def filter(self, **kwargs) -> "Collection":
+        """
+        selects the series whose attributes match the keyword arguments. A
+        sequence matches any of its items; a string is matched as a whole,
+        so e.g. user="li" does not select the series of user "oliveira"
+        """
         out = self.__class__()
         if "_max" in kwargs:
             _max = kwargs.pop("_max")
@@ -85,7 +102,7 @@ class Collection(metaclass=ABCMeta):
             for key, expected in kwargs.items():
                 val = getattr(series, key)
 
-                if isinstance(expected, Sequence):
+                if isinstance(expected, Sequence) and not isinstance(expected, str):
                     if val is None or val not in expected:
                         valid = False
                         break
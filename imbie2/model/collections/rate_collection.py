@@ -111,7 +111,7 @@ class WorkingMassRateCollection(Collection):
         ]:
             # calculate RMS of difference between contributions
             #  and mean at each epoch
-            devs = np.empty((len(self), t.size)) * np.nan
+            devs = np.full((len(self), t.size), np.nan)
 
             for i, s in enumerate(self):
                 i_m, i_s = match(t, s.t, 1.0 / 48)
@@ -9,6 +9,5 @@ class MassChangeCollectionsManager(CollectionsManager):
     def as_collection(self):
         out = MassChangeCollection()
         for col in self:
-            for series in col:
-                out.add_series(series)
+            out.extend(col)
         return out
@@ -9,6 +9,5 @@ class MassRateCollectionsManager(CollectionsManager):
     def as_collection(self):
         out = MassRateCollection()
         for col in self:
-            for series in col:
-                out.add_series(series)
+            out.extend(col)
         return out
\ No newline at end of file
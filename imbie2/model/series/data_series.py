@@ -1,6 +1,7 @@
 from abc import ABCMeta, abstractmethod
 from imbie2.const.basins import Basin, BasinGroup
-from typing import Optional
+from typing import Optional, Tuple
+import numpy as np
 
 
 class DataSeries(metaclass=ABCMeta):
@@ -37,11 +38,26 @@ class DataSeries(metaclass=ABCMeta):
         # number of contributing data series
         self.contributions = contributions
 
+        # memoised statistics of the data arrays
+        self._cache = {}
+
     def limit_times(self, min_t: float=None, max_t: float=None, interp: bool=True) -> None:
         if min_t is not None:
             self._set_min_time(min_t, interp=interp)
         if max_t is not None:
             self._set_max_time(max_t, interp=interp)
+        self._cache.clear()
+
+    def _finite_bounds(self, name: str) -> Tuple[float, float]:
+        """
+        returns the minimum & maximum finite values of the named data array
+        """
+        key = "bounds_" + name
+        if key not in self._cache:
+            data = getattr(self, name)
+            data = data[np.isfinite(data)]
+            self._cache[key] = np.min(data), np.max(data)
+        return self._cache[key]
 
     @abstractmethod
     def _set_min_time(self, min_t: float, interp: bool=True) -> None:
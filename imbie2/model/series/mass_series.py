@@ -1,24 +1,29 @@
 from .data_series import DataSeries
 import numpy as np
 
-from imbie2.util.functions import ts2m, match, smooth_imbie
+from imbie2.util.functions import ts2m_multi, match, smooth_imbie
 from imbie2.util.offset import apply_offset, align_against
 from imbie2.const.basins import BasinGroup, Basin
 import imbie2.model as model
 from typing import Optional
 
 
+def _monotonic(t: np.ndarray) -> bool:
+    """
+    checks that a time axis is free of NaNs and never decreases
+    """
+    return not np.isnan(t).any() and bool(np.all(np.diff(t) >= 0))
+
+
 class MassChangeDataSeries(DataSeries):
 
     @property
     def min_mass(self) -> float:
-        ok = np.isfinite(self.mass)
-        return np.min(self.mass[ok])
+        return self._finite_bounds("mass")[0]
 
     @property
     def max_mass(self) -> float:
-        ok = np.isfinite(self.mass)
-        return np.max(self.mass[ok])
+        return self._finite_bounds("mass")[1]
 
     def __init__(self, user: Optional[str], user_group: Optional[str], data_group: Optional[str],
                  basin_group: BasinGroup, basin_id: Basin, basin_area: float, time: np.ndarray, area: np.ndarray,
@@ -29,8 +34,7 @@ class MassChangeDataSeries(DataSeries):
             computed, merged, aggregated, contributions
         )
         if interpolate:
-            self.t, self.mass = ts2m(time, mass)
-            _, self.errs = ts2m(time, errs)
+            self.t, self.mass, self.errs = ts2m_multi(time, mass, errs)
         else:
             self.t = time
             self.mass = mass
@@ -44,8 +48,14 @@ class MassChangeDataSeries(DataSeries):
     def _get_max_time(self) -> float:
         return np.max(self.t)
 
-    def _set_min_time(self, min_t: float) -> None:
-        ok = self.t >= min_t
+    def _set_min_time(self, min_t: float, interp: bool=True) -> None:
+        # a monotonic time axis keeps a contiguous block of epochs, which can
+        # be sliced rather than masked. Series built with interpolate=False
+        # aren't guaranteed to be sorted or free of NaNs, so they're masked
+        if _monotonic(self.t):
+            ok = slice(np.searchsorted(self.t, min_t, side='left'), None)
+        else:
+            ok = self.t >= min_t
 
         self.t = self.t[ok]
         self.mass = self.mass[ok]
@@ -55,12 +65,15 @@ class MassChangeDataSeries(DataSeries):
             # self.a = self.a[ok]
         self.errs = self.errs[ok]
 
-    def _set_max_time(self, max_t: float) -> None:
-        ok = self.t <= max_t
+    def _set_max_time(self, max_t: float, interp: bool=True) -> None:
+        if _monotonic(self.t):
+            ok = slice(None, np.searchsorted(self.t, max_t, side='right'))
+        else:
+            ok = self.t <= max_t
 
         self.t = self.t[ok]
         self.mass = self.mass[ok]
-        # self.a = self.a[ok[:len(self.a)]]
+        # self.a = self.a[ok]
         self.errs = self.errs[ok]
 
     def reduce(self, interval: float=1., centre=None):
@@ -110,7 +123,7 @@ class MassChangeDataSeries(DataSeries):
         errs = np.hstack(all_windows_errs)
         t_new = np.hstack(all_windows_t)
 
-        a = np.empty_like(t_new) * np.nan
+        a = np.full_like(t_new, np.nan)
 
         return MassChangeDataSeries(
             self.user, self.user_group, self.data_group, self.basin_group, self.basin_id, self.basin_area,
@@ -122,17 +135,26 @@ class MassChangeDataSeries(DataSeries):
             -> "MassChangeDataSeries":
         if isinstance(rate_data, model.series.MassRateDataSeries):
             t = (rate_data.t0 + rate_data.t1) / 2.
-            dM = np.cumsum(rate_data.dmdt) / 12.
-            err = np.cumsum(rate_data.errs) / 12.
+            # scale the cumulative sums in place, rather than allocating
+            # a second array for each division
+            dM = np.cumsum(rate_data.dmdt)
+            dM /= 12.
+            err = np.cumsum(rate_data.errs)
+            err /= 12.
             # TODO: confirm this
             n = t - t[0]; n[0] = 1.
-            err /= np.sqrt(n)
+            np.sqrt(n, out=n)
+            err /= n
 
         elif isinstance(rate_data, model.series.WorkingMassRateDataSeries):
             t = rate_data.t             # t = (rate_data.t[:-1] + rate_data.t[1:]) / 2.
-            dM = np.cumsum(rate_data.dmdt) / 12.
+            dM = np.cumsum(rate_data.dmdt)
+            dM /= 12.
             # err = np.sqrt(np.cumsum(np.square(rate_data.errs / 12)) / np.arange(1, rate_data.errs.size+1))
-            err = np.sqrt(np.cumsum(np.square(rate_data.errs))) / np.sqrt(12) # FIXME: reset
+            err = np.square(rate_data.errs)
+            np.cumsum(err, out=err)
+            np.sqrt(err, out=err)
+            err /= np.sqrt(12) # FIXME: reset
 
         else: raise TypeError("Rates data expected")
 
@@ -177,10 +199,16 @@ class MassChangeDataSeries(DataSeries):
             return None
 
         t = a.t[ia]
-        m = (a.mass[ia] + b.mass[ib]) / 2.
-        e = np.sqrt((np.square(a.errs[ia]) +
-                     np.square(b.errs[ib])) / 2.)
-        ar = (a.a[ia] + b.a[ib]) / 2.
+        # mean of the two series, accumulated into the indexed copy of 'a'
+        m = a.mass[ia]
+        m += b.mass[ib]
+        m *= .5
+        # RMS of the two errors, without squared temporaries
+        e = np.hypot(a.errs[ia], b.errs[ib])
+        e /= np.sqrt(2.)
+        ar = a.a[ia]
+        ar += b.a[ib]
+        ar *= .5
 
         comp = a.computed or b.computed
         aggr = a.aggregated or b.aggregated
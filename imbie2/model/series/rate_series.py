@@ -1,9 +1,8 @@
 from .data_series import DataSeries
 import numpy as np
 from scipy.interpolate import interp1d
-import math
 
-from imbie2.util.functions import match, smooth_imbie, t2m, ts2m
+from imbie2.util.functions import match, nanrms, smooth_imbie, t2m, ts2m_multi
 from imbie2.util.combine import weighted_combine as ts_combine
 from imbie2.util import dm_to_dmdt
 from imbie2.const.basins import BasinGroup, Basin
@@ -15,14 +14,12 @@ from typing import Optional, Tuple
 
 class MassRateDataSeries(DataSeries):
     @property
-    def min_rate(self) -> None:
-        ok = np.isfinite(self.dmdt)
-        return np.min(self.dmdt[ok])
+    def min_rate(self) -> float:
+        return self._finite_bounds("dmdt")[0]
 
     @property
-    def max_rate(self) -> None:
-        ok = np.isfinite(self.dmdt)
-        return np.max(self.dmdt[ok])
+    def max_rate(self) -> float:
+        return self._finite_bounds("dmdt")[1]
 
     def __init__(
         self,
@@ -60,14 +57,14 @@ class MassRateDataSeries(DataSeries):
         self.errs = errs
         self.a = area
 
-    def _set_min_time(self, min_t: float) -> None:
-        ok = np.ones(self.t0.shape, dtype=bool)
-
-        for i, t0 in enumerate(self.t0):
-            if t0 < min_t:
-                self.t0[i] = min_t
-            if self.t1[i] < min_t:
-                ok[i] = False
+    def _set_min_time(self, min_t: float, interp: bool = True) -> None:
+        # clip interval starts to the new minimum, and drop any
+        # intervals which end before it. Intervals with a NaN end are kept
+        np.maximum(self.t0, min_t, out=self.t0)
+        ok = ~(self.t1 < min_t)
+        if ok.all():
+            # nothing to drop: skip copying the arrays
+            return
 
         self.t0 = self.t0[ok]
         self.t1 = self.t1[ok]
@@ -75,14 +72,14 @@ class MassRateDataSeries(DataSeries):
         self.errs = self.errs[ok]
         # self.a = self.a[ok]
 
-    def _set_max_time(self, max_t: float) -> None:
-        ok = np.ones(self.t0.shape, dtype=bool)
-
-        for i, t1 in enumerate(self.t1):
-            if t1 > max_t:
-                self.t1[i] = max_t
-            if self.t0[i] > max_t:
-                ok[i] = False
+    def _set_max_time(self, max_t: float, interp: bool = True) -> None:
+        # clip interval ends to the new maximum, and drop any
+        # intervals which start after it. Intervals with a NaN start are kept
+        np.minimum(self.t1, max_t, out=self.t1)
+        ok = ~(self.t0 > max_t)
+        if ok.all():
+            # nothing to drop: skip copying the arrays
+            return
 
         self.t0 = self.t0[ok]
         self.t1 = self.t1[ok]
@@ -140,11 +137,15 @@ class MassRateDataSeries(DataSeries):
 
     @property
     def sigma(self) -> float:
-        return math.sqrt(np.nanmean(np.square(self.errs))) / np.sqrt(1.0 / self.freq)
+        if "sigma" not in self._cache:
+            self._cache["sigma"] = nanrms(self.errs) / np.sqrt(1.0 / self.freq)
+        return self._cache["sigma"]
 
     @property
     def mean(self) -> float:
-        return np.nanmean(self.dmdt)
+        if "mean" not in self._cache:
+            self._cache["mean"] = np.nanmean(self.dmdt)
+        return self._cache["mean"]
 
     @classmethod
     def merge(
@@ -159,9 +160,16 @@ class MassRateDataSeries(DataSeries):
 
         t0 = a.t0[ia]
         t1 = a.t1[ia]
-        m = (a.dmdt[ia] + b.dmdt[ib]) / 2.0
-        e = np.sqrt((np.square(a.errs[ia]) + np.square(b.errs[ib])) / 2.0)
-        ar = (a.a[ia] + b.a[ib]) / 2.0
+        # mean of the two series, accumulated into the indexed copy of 'a'
+        m = a.dmdt[ia]
+        m += b.dmdt[ib]
+        m *= 0.5
+        # RMS of the two errors, without squared temporaries
+        e = np.hypot(a.errs[ia], b.errs[ib])
+        e /= np.sqrt(2.0)
+        ar = a.a[ia]
+        ar += b.a[ib]
+        ar *= 0.5
 
         comp = a.computed or b.computed
         aggr = a.aggregated or b.aggregated
@@ -186,27 +194,28 @@ class MassRateDataSeries(DataSeries):
     def chunk_rates(self) -> "WorkingMassRateDataSeries":
         ok = self.t0 == self.t1
 
-        time_chunks = [self.t0[ok]]
-        dmdt_chunks = [self.dmdt[ok]]
-        errs_chunks = [self.errs[ok]]
-
-        if np.all(ok):
-            t = time_chunks[0]
-            dmdt = dmdt_chunks[0]
-            errs = errs_chunks[0]
+        if ok.all():
+            # every epoch is instantaneous, so there is nothing to combine
+            # and the arrays can be resampled directly without copying
+            t = self.t0
+            dmdt = self.dmdt
+            errs = self.errs
         else:
-            for i in range(len(self)):
-                if ok[i]:
-                    continue
+            time_chunks = [self.t0[ok]]
+            dmdt_chunks = [self.dmdt[ok]]
+            errs_chunks = [self.errs[ok]]
+
+            # each interval becomes a 2-point chunk; build them all at
+            # once as rows of (K, 2) arrays rather than one at a time
+            bad = ~ok
+            time_chunks.extend(np.column_stack((self.t0[bad], self.t1[bad])))
+            dmdt_chunks.extend(np.repeat(self.dmdt[bad, np.newaxis], 2, axis=1))
+            errs_chunks.extend(np.repeat(self.errs[bad, np.newaxis], 2, axis=1))
 
-                time_chunks.append(np.asarray([self.t0[i], self.t1[i]]))
-                dmdt_chunks.append(np.asarray([self.dmdt[i], self.dmdt[i]]))
-                errs_chunks.append(np.asarray([self.errs[i], self.errs[i]]))
             t, dmdt = ts_combine(time_chunks, dmdt_chunks)
             _, errs = ts_combine(time_chunks, errs_chunks, error_method=ErrorMethod.rms)
 
-        tm, dmdt = ts2m(t, dmdt)
-        _, errs = ts2m(t, errs)
+        tm, dmdt, errs = ts2m_multi(t, dmdt, errs)
 
         return WorkingMassRateDataSeries(
             self.user,
@@ -226,6 +235,16 @@ class MassRateDataSeries(DataSeries):
         return model.series.MassChangeDataSeries.accumulate_mass(self, offset=offset)
 
 
+def _contiguous(values, dtype: type):
+    """
+    returns a numpy array as a C-contiguous array of the given dtype.
+    Anything else (e.g. None) is returned as-is
+    """
+    if isinstance(values, np.ndarray):
+        return np.require(values, dtype=dtype, requirements="C")
+    return values
+
+
 class WorkingMassRateDataSeries(DataSeries):
     def __init__(
         self,
@@ -257,10 +276,12 @@ class WorkingMassRateDataSeries(DataSeries):
             aggregated,
             contributions,
         )
-        self.t = time
+        # store array data as contiguous float arrays, so that the numpy
+        # operations on them don't need to convert or copy them first
+        self.t = _contiguous(time, np.float64)
         self.a = area
-        self.dmdt = dmdt
-        self.errs = errs
+        self.dmdt = _contiguous(dmdt, np.float64)
+        self.errs = _contiguous(errs, np.float64)
         self.trunc_extent = truncate
 
     def get_truncated(self) -> "WorkingMassRateDataSeries":
@@ -279,23 +300,19 @@ class WorkingMassRateDataSeries(DataSeries):
 
     @property
     def min_rate(self) -> float:
-        ok = np.isfinite(self.dmdt)
-        return np.min(self.dmdt[ok])
+        return self._finite_bounds("dmdt")[0]
 
     @property
     def max_rate(self) -> float:
-        ok = np.isfinite(self.dmdt)
-        return np.max(self.dmdt[ok])
+        return self._finite_bounds("dmdt")[1]
 
     @property
     def min_error(self) -> float:
-        ok = np.isfinite(self.errs)
-        return np.min(self.errs[ok])
+        return self._finite_bounds("errs")[0]
 
     @property
     def max_error(self) -> float:
-        ok = np.isfinite(self.errs)
-        return np.max(self.errs[ok])
+        return self._finite_bounds("errs")[1]
 
     @property
     def freq(self) -> float:
@@ -303,13 +320,17 @@ class WorkingMassRateDataSeries(DataSeries):
 
     @property
     def sigma(self) -> float:
-        return math.sqrt(np.nanmean(np.square(self.errs))) / np.sqrt(
-            self.t.max() - self.t.min()
-        )  # np.sqrt(1. / self.freq)
+        if "sigma" not in self._cache:
+            self._cache["sigma"] = nanrms(self.errs) / np.sqrt(
+                self.t.max() - self.t.min()
+            )  # np.sqrt(1. / self.freq)
+        return self._cache["sigma"]
 
     @property
     def mean(self) -> float:
-        return np.nanmean(self.dmdt)
+        if "mean" not in self._cache:
+            self._cache["mean"] = np.nanmean(self.dmdt)
+        return self._cache["mean"]
 
     def _get_min_time(self) -> float:
         return np.min(self.t)
@@ -321,20 +342,22 @@ class WorkingMassRateDataSeries(DataSeries):
         if min_t < self.t.min():
             return
 
-        ok = self.t >= min_t
+        # the time axis is monotonic, so the retained epochs are a
+        # contiguous block and can be sliced rather than masked
+        i = np.searchsorted(self.t, min_t, side="left")
 
         if interp:
             # interpolate values @ new minimum
             new_dmdt = np.interp(min_t, self.t, self.dmdt)
             new_errs = np.interp(min_t, self.t, self.errs)
 
-            self.t = np.hstack((min_t, self.t[ok]))
-            self.dmdt = np.hstack((new_dmdt, self.dmdt[ok]))
-            self.errs = np.hstack((new_errs, self.errs[ok]))
+            self.t = np.hstack((min_t, self.t[i:]))
+            self.dmdt = np.hstack((new_dmdt, self.dmdt[i:]))
+            self.errs = np.hstack((new_errs, self.errs[i:]))
         else:
-            self.t = self.t[ok]
-            self.dmdt = self.dmdt[ok]
-            self.errs = self.errs[ok]
+            self.t = self.t[i:]
+            self.dmdt = self.dmdt[i:]
+            self.errs = self.errs[i:]
         # if self.a is not None:
         #     self.a = self.a[ok]
 
@@ -342,19 +365,19 @@ class WorkingMassRateDataSeries(DataSeries):
         if max_t > self.t.max():
             return
 
-        ok = self.t < max_t
+        i = np.searchsorted(self.t, max_t, side="left")
 
         if interp:
             new_dmdt = np.interp(max_t, self.t, self.dmdt)
             new_errs = np.interp(max_t, self.t, self.errs)
 
-            self.t = np.hstack((self.t[ok], max_t))
-            self.dmdt = np.hstack((self.dmdt[ok], new_dmdt))
-            self.errs = np.hstack((self.errs[ok], new_errs))
+            self.t = np.hstack((self.t[:i], max_t))
+            self.dmdt = np.hstack((self.dmdt[:i], new_dmdt))
+            self.errs = np.hstack((self.errs[:i], new_errs))
         else:
-            self.t = self.t[ok]
-            self.dmdt = self.dmdt[ok]
-            self.errs = self.errs[ok]
+            self.t = self.t[:i]
+            self.dmdt = self.dmdt[:i]
+            self.errs = self.errs[:i]
 
     def integrate(
         self, offset: float = None, align: "MassChangeDataSeries" = None
@@ -365,10 +388,10 @@ class WorkingMassRateDataSeries(DataSeries):
 
     def round_dates(self) -> None:
         self.t = np.round(self.t, decimals=5)
+        self._cache.clear()
 
     def monthly(self) -> "WorkingMassRateDataSeries":
-        tm, dmdt = ts2m(self.t, self.dmdt)
-        _, errs = ts2m(self.t, self.errs)
+        tm, dmdt, errs = ts2m_multi(self.t, self.dmdt, self.errs)
 
         return WorkingMassRateDataSeries(
             self.user,
@@ -391,9 +414,25 @@ class WorkingMassRateDataSeries(DataSeries):
         backfill: bool = False,
         interp: bool = False,
     ) -> "WorkingMassRateDataSeries":
+        reduced, backfilled = self._reduce(interval, centre, backfill, interp)
+        return backfilled if backfill else reduced
+
+    def reduce_and_backfill(
+        self, interval: float = 1.0, centre=None, interp: bool = False
+    ) -> Tuple["WorkingMassRateDataSeries", "WorkingMassRateDataSeries"]:
+        """
+        returns both reduce(backfill=False) and reduce(backfill=True),
+        computing the reduced windows only once. The two results may be
+        the same object if no reduction is required.
+        """
+        return self._reduce(interval, centre, True, interp)
+
+    def _reduce(
+        self, interval: float, centre, backfill: bool, interp: bool
+    ) -> Tuple["WorkingMassRateDataSeries", Optional["WorkingMassRateDataSeries"]]:
         
         if len(self) == 0:
-            return self
+            return self, self
 
         mean_diff = np.mean(np.diff(self.t))
         if mean_diff >= interval:
@@ -407,7 +446,7 @@ class WorkingMassRateDataSeries(DataSeries):
             dmdt = dmdt_interp(t_new)
             errs = errs_interp(t_new)
 
-            return WorkingMassRateDataSeries(
+            reduced = WorkingMassRateDataSeries(
                 self.user,
                 self.user_group,
                 self.data_group,
@@ -422,6 +461,7 @@ class WorkingMassRateDataSeries(DataSeries):
                 computed=self.computed,
                 truncate=self.trunc_extent,
             )
+            return reduced, reduced
 
         #### IMBIE3 update: Add handler for the case where the timeseries starts with a NaN
 
@@ -432,6 +472,10 @@ class WorkingMassRateDataSeries(DataSeries):
         all_windows_dmdt = []
         all_windows_errs = []
         all_windows_t = []
+        # the same windows, backfilled to monthly values
+        all_backfill_dmdt = []
+        all_backfill_errs = []
+        all_backfill_t = []
 
         for start, final in zip(breaks[:-1], breaks[1:]):
             if start + 1 == final:
@@ -480,17 +524,26 @@ class WorkingMassRateDataSeries(DataSeries):
                 t_backfill = np.hstack((t_backfill, [max_t]))
 
                 if window_t.size == 1:
-                    window_dmdt = np.ones_like(t_backfill) * window_dmdt
-                    window_errs = np.ones_like(t_backfill) * window_errs
+                    backfill_dmdt = np.ones_like(t_backfill) * window_dmdt
+                    backfill_errs = np.ones_like(t_backfill) * window_errs
                 else:
                     dmdt_interp = interp1d(window_t, window_dmdt, kind="nearest", fill_value="extrapolate")
                     errs_interp = interp1d(
                         window_t, window_errs, kind="nearest", fill_value="extrapolate"
                     )
-                    window_dmdt = dmdt_interp(t_backfill)
-                    window_errs = errs_interp(t_backfill)
-                window_t, window_dmdt = ts2m(t_backfill, window_dmdt)
-                _, window_errs = ts2m(t_backfill, window_errs)
+                    backfill_dmdt = dmdt_interp(t_backfill)
+                    backfill_errs = errs_interp(t_backfill)
+                backfill_t, backfill_dmdt, backfill_errs = ts2m_multi(t_backfill, backfill_dmdt, backfill_errs)
+
+                if not is_last:
+                    # add extra NaN record to create break
+                    backfill_dmdt = np.hstack((backfill_dmdt, [np.nan]))
+                    backfill_errs = np.hstack((backfill_errs, [np.nan]))
+                    backfill_t = np.hstack((backfill_t, [max_t + half_i]))
+
+                all_backfill_dmdt.append(backfill_dmdt)
+                all_backfill_errs.append(backfill_errs)
+                all_backfill_t.append(backfill_t)
 
             if not is_last:
                 # add extra NaN record to create break
@@ -502,6 +555,12 @@ class WorkingMassRateDataSeries(DataSeries):
             all_windows_errs.append(window_errs)
             all_windows_t.append(window_t)
 
+        reduced = self._reduced_series(all_windows_t, all_windows_dmdt, all_windows_errs)
+        if not backfill:
+            return reduced, None
+        return reduced, self._reduced_series(all_backfill_t, all_backfill_dmdt, all_backfill_errs)
+
+    def _reduced_series(self, all_windows_t, all_windows_dmdt, all_windows_errs) -> "WorkingMassRateDataSeries":
         dmdt = np.hstack(all_windows_dmdt)
         errs = np.hstack(all_windows_errs)
         t_new = np.hstack(all_windows_t)
@@ -534,8 +593,13 @@ class WorkingMassRateDataSeries(DataSeries):
             return None
 
         t = a.t[ia]
-        m = (a.dmdt[ia] + b.dmdt[ib]) / 2.0
-        e = np.sqrt((np.square(a.errs[ia]) + np.square(b.errs[ib])) / 2.0)
+        # mean of the two series, accumulated into the indexed copy of 'a'
+        m = a.dmdt[ia]
+        m += b.dmdt[ib]
+        m *= 0.5
+        # RMS of the two errors, without squared temporaries
+        e = np.hypot(a.errs[ia], b.errs[ib])
+        e /= np.sqrt(2.0)
         ar = None
 
         comp = a.computed or b.computed
@@ -594,8 +658,8 @@ class WorkingMassRateDataSeries(DataSeries):
             )
         except Exception as e:
             t = mass_series.t
-            dmdt = np.ones_like(mass_series.t) * np.nan
-            dmdt_err = np.ones_like(mass_series.t) * np.nan
+            dmdt = np.full_like(mass_series.t, np.nan)
+            dmdt_err = np.full_like(mass_series.t, np.nan)
             print("ERROR:", mass_series.user, mass_series.basin_id.value)
             print(e)
         if truncate:
@@ -208,6 +208,22 @@ class Plotter:
         mpl.rc('ytick.major', width=1, size=5)
         mpl.rc('ytick.minor', width=1, size=3)
 
+    def __getstate__(self):
+        # the current figure is not sent to worker processes,
+        #  each process creates its own figures. The matplotlib settings
+        #  are sent instead, so that workers draw with the settings in
+        #  use at the time the plotter is sent
+        state = self.__dict__.copy()
+        state.pop('fig', None)
+        state.pop('ax', None)
+        state['_rc'] = {key: mpl.rcParams[key] for key in mpl.rcParams if key != 'backend'}
+        return state
+
+    def __setstate__(self, state):
+        state = state.copy()
+        mpl.rcParams.update(state.pop('_rc'))
+        self.__dict__.update(state)
+
     def _get_subplot_shape(self, count: int) -> Tuple[int, int, int]:
         if count == 1:
             w = 1
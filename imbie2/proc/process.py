@@ -1,10 +1,12 @@
-from collections import OrderedDict
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
 from itertools import product
+import csv
+import io
 import os
 import shutil
-from typing import Union, Sequence
-from matplotlib.pyplot import cm
-import matplotlib.pyplot as plt
+from typing import Optional, Union, Sequence
 import pandas as pd
 import numpy as np
 
@@ -14,16 +16,104 @@ from imbie2.const.basins import IceSheet, BasinGroup
 from imbie2.const.error_methods import ErrorMethod
 from imbie2.model.collections import WorkingMassRateCollection, MassChangeCollection, \
                                      MassRateCollection
-from imbie2.plot.plotter import Plotter
-from imbie2.plot import style
 from imbie2.table.tables import MeanErrorsTable, TimeCoverageTable, BasinsTable, \
                                 RegionAveragesTable, RegionGroupAveragesTable
 from imbie2.proc.compare_windows import compare_windows
 from imbie2.util.count_tolerance import count_tolerance
-from imbie2.util.functions import ts2m, match, move_av
-from imbie2.util.discharge import calculate_discharge
+from imbie2.util.functions import ts2m_multi, match, move_av, nanrms, nearest_align
+from imbie2.util.discharge import calculate_discharges
 from imbie2.model.series import WorkingMassRateDataSeries, MassChangeDataSeries
 
+# the ice sheets, and the regions which are composed from them
+_SHEETS = (IceSheet.apis, IceSheet.eais, IceSheet.wais, IceSheet.gris)
+_AIS_SHEETS = (IceSheet.apis, IceSheet.eais, IceSheet.wais)
+_REGIONS = {
+    IceSheet.eais: (IceSheet.eais,),
+    IceSheet.apis: (IceSheet.apis,),
+    IceSheet.wais: (IceSheet.wais,),
+    IceSheet.ais: (IceSheet.apis, IceSheet.eais, IceSheet.wais),
+    IceSheet.gris: (IceSheet.gris,),
+    IceSheet.all: (IceSheet.apis, IceSheet.eais, IceSheet.wais, IceSheet.gris)
+}
+_REGION_ITEMS = tuple(_REGIONS.items())
+# each ice sheet as a region of its own
+_SHEET_REGIONS = {sheet: sheet for sheet in _SHEETS}
+
+
+def _average_series(series: Sequence[WorkingMassRateDataSeries], mode, error_mode, nsigma):
+    """
+    averages a list of series, for use in a worker process. Returns the
+    average along with its console output, so that the parent process
+    can print the output in order
+    """
+    log = io.StringIO()
+    with redirect_stdout(log):
+        average = WorkingMassRateCollection(*series).average(
+            mode=mode, error_mode=error_mode, nsigma=nsigma
+        )
+    return average, log.getvalue()
+
+
+def _first_by(collection, attr: str) -> dict:
+    """
+    maps each value of a series attribute to the first series in the
+    collection with that value, as per 'collection.filter(...).first()'
+    """
+    out = {}
+    for series in collection:
+        out.setdefault(getattr(series, attr), series)
+    return out
+
+
+def _reuse_mass(mass_by_rate: dict, rate: WorkingMassRateDataSeries) -> Optional[MassChangeDataSeries]:
+    """
+    finds the integrated series of a rate series which has already been
+    integrated, provided the rate series has not since been relabelled. A
+    copy is returned, labelled as the rate series is, so that the sheet and
+    region collections don't share a series object
+    """
+    mass = mass_by_rate.get(id(rate))
+    if mass is None or mass.basin_id != rate.basin_id:
+        return None
+    return MassChangeDataSeries(
+        mass.user, mass.user_group, mass.data_group, rate.basin_group, rate.basin_id,
+        rate.basin_area, mass.t.copy(), mass.a, mass.mass.copy(), mass.errs.copy(),
+        computed=mass.computed, merged=mass.merged, aggregated=mass.aggregated,
+        contributions=mass.contributions, interpolate=False
+    )
+
+
+def _savetxt_prefixed(f, prefix: str, *columns: np.ndarray) -> None:
+    """
+    writes columns of values to an open file, each row preceded by the same
+    text. The values are formatted as one float64 block; the text is added
+    to each formatted line, so that any '%' in it is not taken as part of
+    the format
+    """
+    buf = io.StringIO()
+    np.savetxt(buf, np.column_stack(columns).astype(np.float64, copy=False),
+               fmt="%.4f", delimiter=", ")
+    lead = prefix + ", "
+    f.writelines(lead + line for line in buf.getvalue().splitlines(keepends=True))
+
+
+def _run_plots(calls, workers: int=None) -> None:
+    """
+    runs a list of (method, args, kwargs) plotting calls. If more than one
+    worker is requested, the calls are made in a pool of worker processes
+    """
+    if workers is None or workers <= 1:
+        for method, args, kwargs in calls:
+            method(*args, **kwargs)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(method, *args, **kwargs) for method, args, kwargs in calls
+        ]
+    for future in futures:
+        future.result()
+
 
 def prepare_collection(collection: Union[MassRateCollection, MassChangeCollection],
                        config: ImbieConfig) -> WorkingMassRateCollection:
@@ -75,6 +165,36 @@ def prepare_collection(collection: Union[MassRateCollection, MassChangeCollectio
         raise TypeError("Expected dM or dM/dt collection")
     return out, out_smooth
 
+def window_stats(series: WorkingMassRateDataSeries, windows: Sequence[tuple]) -> tuple:
+    """
+    returns the mean & sigma of a series within each (min, max) time window,
+    as per series.truncate(min, max, interp=False).mean/.sigma, but without
+    creating a truncated copy of the series for each window
+    """
+    t, dmdt, errs = series.t, series.dmdt, series.errs
+    if not np.all(t[1:] >= t[:-1]):
+        # the windows are found by bisection, which needs the time-values
+        # in order (with any NaN times last, so that they are excluded)
+        order = np.argsort(t, kind='stable')
+        t, dmdt, errs = t[order], dmdt[order], errs[order]
+
+    windows = np.asarray(windows, dtype=np.float64)
+    beg = np.searchsorted(t, windows[:, 0], side='left')
+    end = np.searchsorted(t, windows[:, 1], side='left')
+
+    means = np.empty(len(windows))
+    sigmas = np.empty(len(windows))
+    for i, (b, e) in enumerate(zip(beg, end)):
+        if b >= e:
+            means[i] = sigmas[i] = np.nan
+            continue
+        t_w = t[b:e]
+        means[i] = np.nanmean(dmdt[b:e])
+        # matches WorkingMassRateDataSeries.sigma
+        sigmas[i] = nanrms(errs[b:e]) / np.sqrt(t_w.max() - t_w.min())
+    return means, sigmas
+
+
 def process(input_data: Sequence[Union[MassRateCollection, MassChangeCollection, WorkingMassRateCollection]],
             config: ImbieConfig, overwrite: bool = False) -> None:
     """
@@ -91,7 +211,12 @@ def process(input_data: Sequence[Union[MassRateCollection, MassChangeCollection,
     output_path = os.path.expanduser(config.output_path)
 
     # check if it exists, clear it if not empty (or abort)
-    if os.path.exists(output_path) and os.listdir(output_path):
+    non_empty = False
+    if os.path.exists(output_path):
+        # only the first entry is needed to tell if the directory is empty
+        with os.scandir(output_path) as entries:
+            non_empty = next(entries, None) is not None
+    if non_empty:
         if not overwrite:
             msg = "WARNING: directory \"%s\" is not empty, contents will be deleted. Proceed? (Y/n): " % output_path
             choice = input(msg)
@@ -99,19 +224,12 @@ def process(input_data: Sequence[Union[MassRateCollection, MassChangeCollection,
                 print("Processor cancelled by user.")
                 return
         shutil.rmtree(output_path)
-    if not os.path.exists(output_path):
-        os.makedirs(output_path)
-
-    sheets = [IceSheet.apis, IceSheet.eais, IceSheet.wais, IceSheet.gris]
-    ais_sheets = [IceSheet.apis, IceSheet.eais, IceSheet.wais]
-    regions = OrderedDict([
-        (IceSheet.eais, [IceSheet.eais]),
-        (IceSheet.apis, [IceSheet.apis]),
-        (IceSheet.wais, [IceSheet.wais]),
-        (IceSheet.ais, [IceSheet.apis, IceSheet.eais, IceSheet.wais]),
-        (IceSheet.gris, [IceSheet.gris]),
-        (IceSheet.all, [IceSheet.apis, IceSheet.eais, IceSheet.wais, IceSheet.gris])
-    ])
+    os.makedirs(output_path, exist_ok=True)
+
+    sheets = list(_SHEETS)
+    ais_sheets = list(_AIS_SHEETS)
+    regions = _REGIONS
+    region_items = _REGION_ITEMS
     offset = config.align_date
 
     # names_ra = [
@@ -162,37 +280,44 @@ def process(input_data: Sequence[Union[MassRateCollection, MassChangeCollection,
 
     rate_data = WorkingMassRateCollection()
     rate_data_unsmoothed = WorkingMassRateCollection()
+    # (group, user, location) keys of the series added so far
+    rate_keys = set()
+    rate_keys_unsmoothed = set()
+    # keep the prepared (smoothed) inputs, for reuse in the comparison plots
+    prepared_data = []
     for collection in input_data:
         unsmoothed_collection, collection = prepare_collection(collection, config)
+        prepared_data.append(collection)
 
+        unique_series = []
         for series in collection:
             # check if there's already a series for this user & location
-            existing = rate_data.filter(
-                user_group=series.user_group,
-                user=series.user,
-                basin_id=series.basin_id,
-                basin_group=series.basin_group
-            )
-            if not existing:
-                rate_data.add_series(series)
+            key = (series.user_group, series.user, series.basin_id, series.basin_group)
+            if key not in rate_keys:
+                rate_keys.add(key)
+                unique_series.append(series)
+        rate_data.extend(unique_series)
 
+        unique_series = []
         for series in unsmoothed_collection:
             # check if there's already a series for this user & location
-            existing = rate_data_unsmoothed.filter(
-                user_group=series.user_group,
-                user=series.user,
-                basin_id=series.basin_id,
-                basin_group=series.basin_group
-            )
-            if not existing:
-                rate_data_unsmoothed.add_series(series)
+            key = (series.user_group, series.user, series.basin_id, series.basin_group)
+            if key not in rate_keys_unsmoothed:
+                rate_keys_unsmoothed.add(key)
+                unique_series.append(series)
+        rate_data_unsmoothed.extend(unique_series)
 
     # rate_data.round_dates()
     # rate_data_unsmoothed.round_dates()
 
     # keep copies of zwally/rignot data before merging them
-    zwally_data = rate_data.filter(basin_group=BasinGroup.zwally)
-    rignot_data = rate_data.filter(basin_group=BasinGroup.rignot)
+    zwally_data = WorkingMassRateCollection()
+    rignot_data = WorkingMassRateCollection()
+    for series in rate_data:
+        if series.basin_group == BasinGroup.zwally:
+            zwally_data.add_series(series)
+        elif series.basin_group == BasinGroup.rignot:
+            rignot_data.add_series(series)
 
     # merge zwally/rignot
     rate_data.merge()
@@ -215,11 +340,26 @@ def process(input_data: Sequence[Union[MassRateCollection, MassChangeCollection,
     regions_rate = WorkingMassRateCollection()
     regions_mass = MassChangeCollection()
 
-    for outlier in config.users_mark:
-        data = rate_data.filter(user=outlier)
-        for series in data:
-            for t, dmdt, e in zip(series.t, series.dmdt, series.errs):
-                print(outlier, series.basin_id, t, dmdt, e)
+    # optionally print the records of the marked users
+    if config.print_marked:
+        # collect the series of the marked users in a single pass
+        users_mark = frozenset(config.users_mark)
+        marked_data = defaultdict(list)
+        for series in rate_data:
+            if series.user in users_mark:
+                marked_data[series.user].append(series)
+
+        # format all the marked records, and print them in one go
+        marked_lines = []
+        for outlier in config.users_mark:
+            for series in marked_data[outlier]:
+                prefix = "%s %s" % (outlier, series.basin_id)
+                records = np.column_stack((series.t, series.dmdt, series.errs)).tolist()
+                marked_lines.extend(
+                    "%s %r %r %r" % (prefix, t, dmdt, e) for t, dmdt, e in records
+                )
+        if marked_lines:
+            print("\n".join(marked_lines))
 
     if config.reduce_window is not None:
         assert config.reduce_window > 0
@@ -234,16 +374,26 @@ def process(input_data: Sequence[Union[MassRateCollection, MassChangeCollection,
     dm_users = set()
     single_point = 0
 
+    # index each input set by user once, rather than filtering per user
+    input_by_user = []
+    for input_set in input_data:
+        by_user = defaultdict(list)
+        for series in input_set:
+            by_user[series.user].append(series)
+        input_by_user.append(by_user)
+    sheet_ids = set(sheets)
+
     for name in names:
-        for input_set in input_data:
-            if len(input_set.filter(user=name, basin_id=sheets)) == 0:
+        for input_set, by_user in zip(input_data, input_by_user):
+            user_series = by_user.get(name, [])
+            if not any(series.basin_id in sheet_ids for series in user_series):
                 continue
             if isinstance(input_set, MassChangeCollection):
                 dm_users.add(name)
             else:
                 dmdt_users.add(name)
                 single_only = True
-                for series in input_set.filter(user=name):
+                for series in user_series:
                     if len(series) > 1:
                         single_only = False
                         break
@@ -266,32 +416,76 @@ def process(input_data: Sequence[Union[MassRateCollection, MassChangeCollection,
     print("      both:", both)
     print("1-len dmdt:", single_point)
 
-    for name in names:
-        for series in rate_data.filter(user=name):
-
-            subfolder = " "
-            if series.computed:
-                subfolder = "dmdt/from_dm/"
-            else:
-                subfolder = "dmdt/from_dmdt/"
-
-            output_dir = os.path.join(output_path, subfolder)
-            if not os.path.exists(output_dir):
-                os.makedirs(output_dir)
+    # group the series by user in a single pass. Users are matched by their
+    # exact name: 'filter(user=name)' treated the name as a sequence, and so
+    # also exported the series of any user whose name is a substring of it
+    rate_by_user = defaultdict(list)
+    for series in rate_data:
+        rate_by_user[series.user].append(series)
+
+    # the output folders for computed & submitted dM/dt, created on first use
+    user_dirs = {
+        True: os.path.join(output_path, "dmdt/from_dm/"),
+        False: os.path.join(output_path, "dmdt/from_dmdt/")
+    }
+    created_dirs = set()
+
+    for name, user_series in rate_by_user.items():
+        for series in user_series:
+            output_dir = user_dirs[bool(series.computed)]
+            if output_dir not in created_dirs:
+                os.makedirs(output_dir, exist_ok=True)
+                created_dirs.add(output_dir)
             fname = os.path.join(output_dir, name.replace("/", "_") + ".csv")
 
-            with open(fname, 'a') as f:
-                for line in zip(series.t, series.dmdt, series.errs):
-                    line = series.user_group + ", " + name + ", " + series.basin_id.value + ", " +\
-                            series.basin_group.name + ", " + ", ".join(["%.4f" % n for n in line]) + "\n"
-                    f.write(line)
+            # the identifying columns are constant for the whole series, so
+            # write them as a single prefix and all rows in one call
+            prefix = ", ".join([
+                series.user_group, name, series.basin_id.value, series.basin_group.name
+            ])
+
+            with open(fname, 'a', buffering=1 << 20) as f:
+                _savetxt_prefixed(f, prefix, series.t, series.dmdt, series.errs)
     print("done.")
 
 
+    # group the input series by (group, ice sheet) in a single pass, rather
+    # than re-scanning the whole collection for each combination. As for the
+    # other indexes in this function and Collection.filter, keys are matched
+    # exactly
+    rate_by_group_sheet = {}
+    for series in rate_data:
+        key = (series.user_group, series.basin_id)
+        rate_by_group_sheet.setdefault(key, []).append(series)
+
+    # integrated series of the sheet averages, by id of the rate series. A
+    # region of a single sheet reuses that sheet's series, so it can reuse
+    # its integrated series too
+    sheets_mass_by_rate = {}
+
+    # the per-group sheet averages are independent of each other, so if
+    # requested they are computed up-front in a pool of worker processes.
+    # Single series are left to the main loop, as 'average' returns them as-is
+    pooled_averages = {}
+    if config.average_workers is not None and config.average_workers > 1:
+        with ProcessPoolExecutor(max_workers=config.average_workers) as executor:
+            futures = {
+                key: executor.submit(
+                    _average_series, series, config.combine_method,
+                    config.group_avg_errors_method, config.average_nsigma
+                )
+                for key, series in rate_by_group_sheet.items()
+                if key[0] in groups and key[1] in sheets and len(series) > 1
+            }
+            pooled_averages = {key: future.result() for key, future in futures.items()}
+
     for group in groups:
+        # per-sheet averages computed for this group, in insertion order
+        group_sheets_rate = []
+        group_sheets_mass = []
         for sheet in sheets:
-            col = rate_data.filter(
-                user_group=group, basin_id=sheet
+            col = WorkingMassRateCollection(
+                *rate_by_group_sheet.get((group, sheet), [])
             )
             
             # min_time = col.min_rate_time()
@@ -323,26 +517,31 @@ def process(input_data: Sequence[Union[MassRateCollection, MassChangeCollection,
 
             print("computing", group, "average for", sheet.value, end="... ")
 
-            new_series = rate_data.filter(
-                user_group=group, basin_id=sheet
-            ).average(
-                mode=config.combine_method,
-                error_mode=config.group_avg_errors_method,
-                nsigma=config.average_nsigma
-            )
+            if (group, sheet) in pooled_averages:
+                new_series, log = pooled_averages[group, sheet]
+                print(log, end="")
+            else:
+                new_series = col.average(
+                    mode=config.combine_method,
+                    error_mode=config.group_avg_errors_method,
+                    nsigma=config.average_nsigma
+                )
             if new_series is None:
                 continue
 
-            groups_sheets_rate.add_series(new_series)
-            groups_sheets_mass.add_series(
-                new_series.integrate(offset=offset)
-            )
+            group_sheets_rate.append(new_series)
+            new_mass = new_series.integrate(offset=offset)
+            sheets_mass_by_rate[id(new_series)] = new_mass
+            group_sheets_mass.append(new_mass)
             print("done.")
-        for region, sheets in regions.items():
+        groups_sheets_rate.extend(group_sheets_rate)
+        groups_sheets_mass.extend(group_sheets_mass)
+        for region, sheets in region_items:
             print("computing", group, "average for", region.value, end="... ")
 
-            region_rate = groups_sheets_rate.filter(
-                user_group=group, basin_id=sheets
+            region_sheets = set(sheets)
+            region_rate = WorkingMassRateCollection(
+                *[s for s in group_sheets_rate if s.basin_id in region_sheets]
             ).sum(error_method=config.sum_errors_method)
             if region_rate is None:
                 continue
@@ -351,17 +550,26 @@ def process(input_data: Sequence[Union[MassRateCollection, MassChangeCollection,
             
             if config.data_smoothing_window is not None:
                 region_rate = region_rate.smooth(config.data_smoothing_window, iters=config.data_smoothing_iters) #clip=True
-            region_mass = region_rate.integrate(offset=offset)
+            region_mass = _reuse_mass(sheets_mass_by_rate, region_rate)
+            if region_mass is None:
+                region_mass = region_rate.integrate(offset=offset)
 
             groups_regions_rate.add_series(region_rate)
             groups_regions_mass.add_series(region_mass)
             print("done.")
 
+    # per-group averages for each ice sheet, in insertion order. These are
+    # gathered by their current ice sheet only now, as a region summed from a
+    # single sheet average relabels that series in place
+    sheet_groups_rate = defaultdict(list)
+    for series in groups_sheets_rate:
+        sheet_groups_rate[series.basin_id].append(series)
+
     for sheet in sheets:
         print("computing inter-group average for", sheet.value, end="... ")
 
-        sheet_rate_avg = groups_sheets_rate.filter(
-            basin_id=sheet
+        sheet_rate_avg = WorkingMassRateCollection(
+            *sheet_groups_rate[sheet]
         ).average(
             mode=config.combine_method,
             error_mode=config.sheet_avg_errors_method,
@@ -371,17 +579,18 @@ def process(input_data: Sequence[Union[MassRateCollection, MassChangeCollection,
             continue
 
         sheets_rate.add_series(sheet_rate_avg)
-        sheets_mass.add_series(
-            sheet_rate_avg.integrate(offset=offset)
-        )
+        sheet_mass_avg = sheet_rate_avg.integrate(offset=offset)
+        sheets_mass_by_rate[id(sheet_rate_avg)] = sheet_mass_avg
+        sheets_mass.add_series(sheet_mass_avg)
         print("done.")
 
     # compute region figures
-    for region, sheets in regions.items():
+    for region, sheets in region_items:
         print("computing inter-group average for", region.value, end="... ")
 
-        region_rate = sheets_rate.filter(
-            basin_id=sheets
+        region_sheets = set(sheets)
+        region_rate = WorkingMassRateCollection(
+            *[s for s in sheets_rate if s.basin_id in region_sheets]
         ).sum(error_method=config.sum_errors_method)
         if region_rate is None:
             continue
@@ -391,20 +600,35 @@ def process(input_data: Sequence[Union[MassRateCollection, MassChangeCollection,
         if config.data_smoothing_window is not None:
             region_rate = region_rate.smooth(config.data_smoothing_window, iters=config.data_smoothing_iters)
         regions_rate.add_series(region_rate)
-        regions_mass.add_series(
-            region_rate.integrate(offset=offset)
-        )
+        region_mass = _reuse_mass(sheets_mass_by_rate, region_rate)
+        if region_mass is None:
+            region_mass = region_rate.integrate(offset=offset)
+        regions_mass.add_series(region_mass)
         print("done.")
         
+    # index the inter-group averages by region, for use in the remaining processing
+    regions_rate_by_id = _first_by(regions_rate, 'basin_id')
+    regions_mass_by_id = _first_by(regions_mass, 'basin_id')
+
+    # look up the greenland results once, for use in the remaining processing
+    gris_data = rate_data.filter(basin_id=IceSheet.gris)
+    groups_gris = groups_regions_rate.filter(basin_id=IceSheet.gris)
+    groups_gris_by_group = _first_by(groups_gris, 'user_group')
+    sheets_gris = sheets_rate.filter(basin_id=IceSheet.gris)
+    regions_gris_rate = regions_rate_by_id.get(IceSheet.gris)
+
     # calculate dicharge
-    gris_rate = regions_rate.filter(basin_id=IceSheet.gris).first()
-    gris_mass = regions_mass.filter(basin_id=IceSheet.gris).first()
+    gris_rate = regions_gris_rate
+    gris_mass = regions_mass_by_id.get(IceSheet.gris)
     # - read SMB data
     if config.smb_data_path is not None:
         smb_data = pd.read_csv(
             config.smb_data_path,
             names=['year', 'smb', 'err'],
-            index_col='year'
+            index_col='year',
+            dtype=np.float64,
+            engine='c',
+            memory_map=True
         )
         smb_t = smb_data.index.values
         smb_rate = smb_data.smb.values * 12.
@@ -412,50 +636,54 @@ def process(input_data: Sequence[Union[MassRateCollection, MassChangeCollection,
 
         smb_rate_series = WorkingMassRateDataSeries(
             'SMB', 'SMB', 'SMB', BasinGroup.sheets, IceSheet.gris,
-            np.nan, smb_t, np.ones(smb_t.shape) * np.nan, smb_rate,
+            np.nan, smb_t, np.full(smb_t.shape, np.nan), smb_rate,
             smb_rate_err
         ).reduce(1, .45, backfill=True)
-        smb_t12, smb_dmdt12 = ts2m(smb_rate_series.t, smb_rate_series.dmdt)
-        _, smb_errs12 = ts2m(smb_rate_series.t, smb_rate_series.errs)
+        smb_t12, smb_dmdt12, smb_errs12 = ts2m_multi(
+            smb_rate_series.t, smb_rate_series.dmdt, smb_rate_series.errs
+        )
 
         smb_rate_series = WorkingMassRateDataSeries(
             'SMB', 'SMB', 'SMB', BasinGroup.sheets, IceSheet.gris,
-            np.nan, smb_t12, np.ones(smb_t.shape) * np.nan, smb_dmdt12,
+            np.nan, smb_t12, np.full(smb_t.shape, np.nan), smb_dmdt12,
             smb_errs12
         )
         smb_mass_series = smb_rate_series.integrate()
         smb_mass_smooth = smb_rate_series.smooth(3.083333).integrate()
 
-        groups_discharge_rate = WorkingMassRateCollection()
-        mean_discharge_rate = calculate_discharge(gris_rate, smb_rate_series)
-        mean_discharge_rate.user_group = 'all'
-
+        groups_gris_rate = []
         for group in groups:
-            series = groups_regions_rate.filter(
-                basin_id=IceSheet.gris, user_group=group
-            ).first()
+            series = groups_gris_by_group.get(group)
 
             print(group, series)
 
             if series is None:
                 continue
 
-            groups_discharge_rate.add_series(
-                calculate_discharge(series, smb_rate_series)
-            )
+            groups_gris_rate.append(series)
+
+        # calculate all the discharges against a single resampling of the SMB
+        mean_discharge_rate, *groups_discharge = calculate_discharges(
+            [gris_rate, *groups_gris_rate], smb_rate_series
+        )
+        mean_discharge_rate.user_group = 'all'
+        groups_discharge_rate = WorkingMassRateCollection(*groups_discharge)
 
         if config.discharge_data_path is not None:
             mouginot_data = pd.read_csv(
                 config.discharge_data_path,
                 names=['year', 'discharge', 'error'],
-                index_col='year'
+                index_col='year',
+                dtype=np.float64,
+                engine='c',
+                memory_map=True
             )
             mouginot_t = np.asarray(
-                mouginot_data.index.values, dtype=np.float)
+                mouginot_data.index.values, dtype=np.float64)
             mouginot_mass = np.asarray(
-                mouginot_data.discharge.values, dtype=np.float)
+                mouginot_data.discharge.values, dtype=np.float64)
             mouginot_errs = np.asarray(
-                mouginot_data.error.values, dtype=np.float)
+                mouginot_data.error.values, dtype=np.float64)
 
             users_discharge_mass = MassChangeCollection(
                 MassChangeDataSeries(
@@ -475,84 +703,72 @@ def process(input_data: Sequence[Union[MassRateCollection, MassChangeCollection,
         # SMB + Dynamics
 
         if config.output_timestep is not None:
-            mean_discharge_mass = mean_discharge_rate.reduce(
-                config.output_timestep, config.output_offset, backfill=True
-            ).integrate().reduce(config.output_timestep, config.output_offset)
-
-            smb_mass_series = smb_rate_series.reduce(
-                config.output_timestep, config.output_offset, backfill=True
-            ).integrate().reduce(config.output_timestep, config.output_offset)
+            # reduce each rate series once, keeping both the reduced rates
+            # and the monthly backfilled rates from which the mass is integrated
+            mean_discharge_rate, mean_discharge_backfill = mean_discharge_rate.reduce_and_backfill(
+                config.output_timestep, config.output_offset
+            )
+            mean_discharge_mass = mean_discharge_backfill.integrate().reduce(
+                config.output_timestep, config.output_offset
+            )
 
-            gris_mass = gris_rate.reduce(
-                config.output_timestep, config.output_offset, backfill=True
-            ).integrate().reduce(config.output_timestep, config.output_offset)
+            smb_rate_series, smb_backfill = smb_rate_series.reduce_and_backfill(
+                config.output_timestep, config.output_offset
+            )
+            smb_mass_series = smb_backfill.integrate().reduce(
+                config.output_timestep, config.output_offset
+            )
 
-            mean_discharge_rate = mean_discharge_rate.reduce(config.output_timestep, config.output_offset)
-            smb_rate_series = smb_rate_series.reduce(config.output_timestep, config.output_offset)
-            gris_rate = gris_rate.reduce(config.output_timestep, config.output_offset)
+            gris_rate, gris_backfill = gris_rate.reduce_and_backfill(
+                config.output_timestep, config.output_offset
+            )
+            gris_mass = gris_backfill.integrate().reduce(
+                config.output_timestep, config.output_offset
+            )
             # mean_discharge_mass = mean_discharge_mass.reduce(config.output_timestep, config.output_offset)
             # smb_mass_series = smb_mass_series.reduce(config.output_timestep, config.output_offset)
             # gris_mass = gris_mass.reduce(config.output_timestep, config.output_offset)
         # write CSV data
-        dyn_df = pd.DataFrame(
-            data={
-                'dynamics_dmdt': pd.Series(
-                    mean_discharge_rate.dmdt, index=mean_discharge_rate.t),
-                'dynamics_dmdt_sd': pd.Series(
-                    mean_discharge_rate.errs, index=mean_discharge_rate.t)
-            }
+        # (the discharge & total series are aligned to the SMB time-values)
+        dyn_dmdt, dyn_errs = nearest_align(
+            smb_rate_series.t, mean_discharge_rate.t,
+            mean_discharge_rate.dmdt, mean_discharge_rate.errs, tol=1./24
         )
-        smb_df = pd.DataFrame(
-            data={
-                'smb_dmdt': pd.Series(
-                    smb_rate_series.dmdt, index=smb_rate_series.t),
-                'smb_dmdt_sd': pd.Series(
-                    smb_rate_series.errs, index=smb_rate_series.t)
-            }
+        imb_dmdt, imb_errs = nearest_align(
+            smb_rate_series.t, gris_rate.t, gris_rate.dmdt, gris_rate.errs, tol=1./24
         )
-        imb_df = pd.DataFrame(
+        df = pd.DataFrame(
             data={
-                'imbie_dmdt': pd.Series(
-                    gris_rate.dmdt, index=gris_rate.t),
-                'imbie_dmdt_sd': pd.Series(
-                    gris_rate.errs, index=gris_rate.t)
-            }
+                'smb_dmdt': smb_rate_series.dmdt,
+                'smb_dmdt_sd': smb_rate_series.errs,
+                'imbie_dmdt': imb_dmdt,
+                'imbie_dmdt_sd': imb_errs,
+                'dynamics_dmdt': dyn_dmdt,
+                'dynamics_dmdt_sd': dyn_errs
+            },
+            index=smb_rate_series.t
         )
-        md = dyn_df.reindex(smb_df.index, method='nearest', tolerance=1./24)
-        mi = imb_df.reindex(smb_df.index, method='nearest', tolerance=1./24)
-        
-        df = smb_df.merge(mi, left_index=True, right_index=True).merge(md, left_index=True, right_index=True)
         df.to_csv(os.path.join(output_path, 'imbie_smb_dynamics_dmdt.csv'))
 
         # write CSV dM 
-        dyn_df = pd.DataFrame(
-            data={
-                'dyn_dm': pd.Series(
-                    mean_discharge_mass.mass, index=mean_discharge_mass.t),
-                'dyn_dm_sd': pd.Series(
-                    mean_discharge_mass.errs, index=mean_discharge_mass.t)
-            }
+        dyn_dm, dyn_dm_errs = nearest_align(
+            smb_mass_series.t, mean_discharge_mass.t,
+            mean_discharge_mass.mass, mean_discharge_mass.errs, tol=1./24
         )
-        smb_df = pd.DataFrame(
-            data={
-                'smb_dm': pd.Series(
-                    smb_mass_series.mass, index=smb_mass_series.t),
-                'smb_dm_sd': pd.Series(
-                    smb_mass_series.errs, index=smb_mass_series.t)
-            }
+        imb_dm, imb_dm_errs = nearest_align(
+            smb_mass_series.t, gris_mass.t, gris_mass.mass, gris_mass.errs, tol=1./24
         )
-        imb_df = pd.DataFrame(
+        df = pd.DataFrame(
             data={
-                'imbie_dm': pd.Series(
-                    gris_mass.mass, index=gris_mass.t),
-                'imbie_dm_sd': pd.Series(
-                    gris_mass.errs, index=gris_mass.t)
-            }
+                'smb_dm': smb_mass_series.mass,
+                'smb_dm_sd': smb_mass_series.errs,
+                'imbie_dm': imb_dm,
+                'imbie_dm_sd': imb_dm_errs,
+                'dyn_dm': dyn_dm,
+                'dyn_dm_sd': dyn_dm_errs
+            },
+            index=smb_mass_series.t
         )
-        md = dyn_df.reindex(smb_df.index, method='nearest', tolerance=1./24)
-        mi = imb_df.reindex(smb_df.index, method='nearest', tolerance=1./24)
-        
-        df = smb_df.merge(mi, left_index=True, right_index=True).merge(md, left_index=True, right_index=True)
         df.to_csv(os.path.join(output_path, 'accumulated_dm.csv'))
 
         windows = [
@@ -563,31 +779,28 @@ def process(input_data: Sequence[Union[MassRateCollection, MassChangeCollection,
             (2012, 2020), (1992, 2020),
             (1993.5, 2018.5), (2006.5, 2018.5)
         ]
-        imb_tab = []
-        smb_tab = []
-        dyn_tab = []
-        headers = []
-
-        for w0, w1 in windows:
-            smb_w = smb_rate_series.truncate(w0, w1, interp=False)
-            dyn_w = mean_discharge_rate.truncate(w0, w1, interp=False)
-            imb_w = gris_rate.truncate(w0, w1, interp=False)
-
-            smb_tab.append('%.1f\u00B1%.1f' % (smb_w.mean, smb_w.sigma))
-            dyn_tab.append('%.1f\u00B1%.1f' % (dyn_w.mean, dyn_w.sigma))
-            imb_tab.append('%.1f\u00B1%.1f' % (imb_w.mean, imb_w.sigma))
-            headers.append('%f-%f' % (w0, w1))
+        headers = ['%f-%f' % (w0, w1) for w0, w1 in windows]
+        smb_tab = [
+            '%.1f\u00B1%.1f' % ms for ms in zip(*window_stats(smb_rate_series, windows))
+        ]
+        dyn_tab = [
+            '%.1f\u00B1%.1f' % ms for ms in zip(*window_stats(mean_discharge_rate, windows))
+        ]
+        imb_tab = [
+            '%.1f\u00B1%.1f' % ms for ms in zip(*window_stats(gris_rate, windows))
+        ]
 
         fpath = os.path.join(output_path, 'smb_dynamics_table.csv')
+        buf = io.StringIO()
+        writer = csv.writer(buf, lineterminator='\n')
+        writer.writerows([
+            [''] + headers,
+            ['Total'] + imb_tab,
+            ['SMB'] + smb_tab,
+            ['Dynamics'] + dyn_tab
+        ])
         with open(fpath, 'w') as f:
-            line = ','.join([''] + headers)
-            f.write(line+'\n')
-            line = ','.join(['Total'] + imb_tab)
-            f.write(line+'\n')
-            line = ','.join(['SMB'] + smb_tab)
-            f.write(line+'\n')
-            line = ','.join(['Dynamics'] + dyn_tab)
-            f.write(line+'\n')
+            f.write(buf.getvalue())
         
         print('     ', *headers, sep='\t')
         print('Total', *imb_tab, sep='\t')
@@ -595,42 +808,63 @@ def process(input_data: Sequence[Union[MassRateCollection, MassChangeCollection,
         print('Dynam', *dyn_tab, sep='\t')
 
 
-    t_start = int(
-        sheets_rate.filter(basin_id=IceSheet.gris).min_time()
-    )
-    t_final = int(
-        sheets_rate.filter(basin_id=IceSheet.gris).max_time()
-    )
-    for group in (*groups, 'ALL'):
-        year = pd.Series(np.arange(t_start, t_final), name='year')
-        mean = pd.Series(np.zeros(year.size)*np.nan, name='mean', index=year)
-        stdev = pd.Series(np.zeros(year.size)*np.nan, name='stdev', index=year)
-        min_ = pd.Series(np.zeros(year.size)*np.nan, name='min', index=year)
-        max_ = pd.Series(np.zeros(year.size)*np.nan, name='max', index=year)
-        count = pd.Series(np.zeros(year.size, dtype=np.int), name='contributions', index=year)
+    t_start = int(sheets_gris.min_time())
+    t_final = int(sheets_gris.max_time())
+    years = np.arange(t_start, t_final)
 
-        if group == 'ALL':
-            group_ind = rate_data.filter(basin_id=IceSheet.gris)
-        else:
-            group_ind = rate_data.filter(
-                basin_id=IceSheet.gris,
-                user_group=group
-            )
+    # compute the annual mean of each individual greenland series once, so
+    # that the per-group and 'ALL' statistics can share them
+    ann_groups = []
+    ann_years = []
+    ann_means = []
+    for series in gris_data:
+        # years which the series overlaps (as selected by get_window). The
+        # bounds ignore NaN epochs, as get_window does
+        overlap = (years < np.nanmax(series.t)) & (years + 1 > np.nanmin(series.t))
 
-        for y0 in year:
+        for y0 in years[overlap]:
             y1 = y0 + 1
 
-            group_ind_year = group_ind.get_window(y0, y1)
-            group_ind_year_avgs = np.array(
-                [s.mean for s in group_ind_year if s.min_time < y1 and s.max_time > y0]
-            )
+            series_year = series.truncate(y0, y1)
+            if series_year.min_time < y1 and series_year.max_time > y0:
+                ann_groups.append(series.user_group)
+                ann_years.append(y0)
+                ann_means.append(series_year.mean)
+
+    ann_groups = np.array(ann_groups, dtype=object)
+    ann_years = np.array(ann_years, dtype=years.dtype)
+    ann_means = np.array(ann_means, dtype=np.float64)
+
+    for group in (*groups, 'ALL'):
+        year = pd.Series(years, name='year')
+        mean = pd.Series(np.full(year.size, np.nan), name='mean', index=year)
+        stdev = pd.Series(np.full(year.size, np.nan), name='stdev', index=year)
+        min_ = pd.Series(np.full(year.size, np.nan), name='min', index=year)
+        max_ = pd.Series(np.full(year.size, np.nan), name='max', index=year)
+        count = pd.Series(np.zeros(year.size, dtype=np.int64), name='contributions', index=year)
 
-            mean[y0] = np.nanmean(group_ind_year_avgs) if group_ind_year_avgs.size else np.nan
-            min_[y0] = np.nanmin(group_ind_year_avgs) if group_ind_year_avgs.size else np.nan
-            max_[y0] = np.nanmax(group_ind_year_avgs) if group_ind_year_avgs.size else np.nan
-            stdev[y0] = np.nanstd(group_ind_year_avgs) if group_ind_year_avgs.size else np.nan
+        if group == 'ALL':
+            group_years = ann_years
+            group_means = ann_means
+        else:
+            ok = ann_groups == group
+            group_years = ann_years[ok]
+            group_means = ann_means[ok]
+
+        # bin the annual means by year. The sort is stable, so the values
+        # in each bin stay in series order.
+        order = np.argsort(group_years, kind='stable')
+        group_years = group_years[order]
+        group_means = group_means[order]
+        bin_years, bin_starts = np.unique(group_years, return_index=True)
+
+        for y0, group_ind_year_avgs in zip(bin_years, np.split(group_means, bin_starts[1:])):
+            mean[y0] = np.nanmean(group_ind_year_avgs)
+            min_[y0] = np.nanmin(group_ind_year_avgs)
+            max_[y0] = np.nanmax(group_ind_year_avgs)
+            stdev[y0] = np.nanstd(group_ind_year_avgs)
             count[y0] = group_ind_year_avgs.size
-        
+
         fname = os.path.join(output_path, '%s_annual_stats.csv' % group)
         df = pd.DataFrame(
             {mean.name: mean,
@@ -654,18 +888,13 @@ def process(input_data: Sequence[Union[MassRateCollection, MassChangeCollection,
         basin_id=IceSheet.gris
     ).common_period()
 
-    cdata = sheets_rate.filter(
-        basin_id=IceSheet.gris
-    ).first().truncate(c0, c1)
+    cdata = sheets_gris.first().truncate(c0, c1)
 
     # print('greenland xgroup common:', c0, c1)
     # print('greenland xgroup stdev range:', cdata.errs.min(), cdata.errs.max())
 
     for group in groups:
-        group_data = rate_data.filter(
-            user_group=group,
-            basin_id=IceSheet.gris
-        )
+        group_data = gris_data.filter(user_group=group)
         # t0, t1 = group_data.common_period()
         # print('Greenland/%s common period:' % group, t0, '-', t1)
 
@@ -817,8 +1046,6 @@ def process(input_data: Sequence[Union[MassRateCollection, MassChangeCollection,
     #     sys.exit(0)
 
     # print tables
-    output_path = os.path.expanduser(config.output_path)
-
     met = MeanErrorsTable(rate_data, style=config.table_format)
     filename = os.path.join(output_path, "mean_errors."+met.default_extension())
 
@@ -856,7 +1083,7 @@ def process(input_data: Sequence[Union[MassRateCollection, MassChangeCollection,
     filename = os.path.join(output_path, "region_window_averages." + rat.default_extension())
 
     for region in regions:
-        series = regions_rate.filter(basin_id=region).first()
+        series = regions_rate_by_id.get(region)
         print(region.value,
               "{:.1f}-{:.1f}".format(series.min_time, series.max_time),
               "({:.1f})".format(series.max_time-series.min_time))
@@ -898,8 +1125,11 @@ def process(input_data: Sequence[Union[MassRateCollection, MassChangeCollection,
     # print("writing table:", filename)
     # rgt.write(filename)
 
+    # the input series of each group, shared by the tables and plots below
+    rate_data_by_group = {group: rate_data.filter(user_group=group) for group in groups}
+
     for group in groups:
-        tct = TimeCoverageTable(rate_data.filter(user_group=group), style=config.table_format)
+        tct = TimeCoverageTable(rate_data_by_group[group], style=config.table_format)
         filename = os.path.join(
             output_path, "time_coverage_" + group + "." + tct.default_extension()
         )
@@ -934,6 +1164,10 @@ def process(input_data: Sequence[Union[MassRateCollection, MassChangeCollection,
     #         frame.to_csv('{}_{}_mean_difference.csv'.format(sheet.value, group))
 
     # draw plots
+    # the plotting modules are only needed from here on, so they are
+    # imported here rather than when the module is first loaded
+    from imbie2.plot.plotter import Plotter
+
     plotter = Plotter(
         filetype=config.plot_format,
         path=output_path,
@@ -1033,9 +1267,7 @@ def process(input_data: Sequence[Union[MassRateCollection, MassChangeCollection,
     dmdt_comparison_plot = False # disable dM/dt vs recovered dM/dt comparisons (in block below)
 
     if len(input_data) == 2 and dmdt_comparison_plot:
-        from functools import partial
-        prepare = partial(prepare_collection, config=config)
-        data_a, data_b = map(prepare, input_data)
+        data_a, data_b = prepared_data
         for sheet in sheets:
             for group in groups:
                 data_a_sel = data_a.filter(
@@ -1049,17 +1281,23 @@ def process(input_data: Sequence[Union[MassRateCollection, MassChangeCollection,
                 plotter.named_dmdt_comparison_plot(data_a_sel, data_b_sel, name)
 
     # rignot/zwally comparison
+    # rignot_zwally_data = rignot_data + zwally_data
     # for sheet in sheets:
     #     plotter.rignot_zwally_comparison(
-    #         rignot_data+zwally_data, [sheet]
+    #         rignot_zwally_data, [sheet]
     #     )
+    # the series cropped to their truncation windows are shared by the
+    # plots below, so crop them once rather than for each plot
+    groups_regions_rate_cropped = groups_regions_rate.window_cropped()
+    rate_data_unsmoothed_cropped = rate_data_unsmoothed.window_cropped()
+
     # error bars (IMBIE1 style plot)
     window = config.bar_plot_min_time, config.bar_plot_max_time
     plotter.sheets_error_bars(
-        groups_regions_rate.window_cropped(), regions_rate, groups, regions, window=window
+        groups_regions_rate_cropped, regions_rate, groups, regions, window=window
     )
     plotter.sheets_error_bars(
-        groups_regions_rate.window_cropped(), regions_rate, groups, regions,
+        groups_regions_rate_cropped, regions_rate, groups, regions,
         window=window, ylabels=True, suffix="labeled"
     )
     ais_regions = regions.copy()
@@ -1067,19 +1305,19 @@ def process(input_data: Sequence[Union[MassRateCollection, MassChangeCollection,
     ais_regions.pop(IceSheet.gris)
     
     plotter.sheets_error_bars(
-        groups_regions_rate.window_cropped(), regions_rate, groups, ais_regions,
+        groups_regions_rate_cropped, regions_rate, groups, ais_regions,
         window=window, suffix='ais',
     )
     plotter.sheets_error_bars(
-        groups_regions_rate.window_cropped(), regions_rate, groups, ais_regions,
+        groups_regions_rate_cropped, regions_rate, groups, ais_regions,
         window=window, ylabels=True, suffix="ais_labeled"
     )
     plotter.sheets_error_bars(
-        groups_regions_rate.window_cropped(), regions_rate, groups, [IceSheet.gris],
+        groups_regions_rate_cropped, regions_rate, groups, [IceSheet.gris],
         window=window, suffix='gris',
     )
     plotter.sheets_error_bars(
-        groups_regions_rate.window_cropped(), regions_rate, groups, [IceSheet.gris],
+        groups_regions_rate_cropped, regions_rate, groups, [IceSheet.gris],
         window=window, ylabels=True, suffix="gris_labeled"
     )
 
@@ -1089,119 +1327,127 @@ def process(input_data: Sequence[Union[MassRateCollection, MassChangeCollection,
     imbie1_avgs = WorkingMassRateCollection()
 
     for sheet, group in product(sheets, groups):
-        alt_avg = rate_data.filter(
-            basin_id=sheet,
-            user_group=group
+        alt_avg = WorkingMassRateCollection(
+            *rate_by_group_sheet.get((group, sheet), [])
         ).average(
             mode=config.combine_method,
             error_mode=ErrorMethod.imbie1
         )
         imbie1_avgs.add_series(alt_avg)
 
+    # the smoothed group averages are shared by the plots below, so smooth
+    # them once rather than for each plot
+    groups_regions_rate_smooth = groups_regions_rate.smooth(
+        config.plot_smooth_window, iters=config.plot_smooth_iters
+    )
+
     if config.truncate_avg:
         plotter.named_dmdt_all(
-            ais_sheets, groups, rate_data_unsmoothed.window_cropped(),
-            groups_regions_rate.window_cropped(), suffix="ais"
+            ais_sheets, groups, rate_data_unsmoothed_cropped,
+            groups_regions_rate_cropped, suffix="ais"
         )
         plotter.named_dmdt_all(
-            ais_sheets, groups, rate_data_unsmoothed.window_cropped(),
-            groups_regions_rate.window_cropped(),
+            ais_sheets, groups, rate_data_unsmoothed_cropped,
+            groups_regions_rate_cropped,
             sharex=True, suffix="ais"
         )
         plotter.named_dmdt_all(
-            sheets, groups, rate_data_unsmoothed.window_cropped(),
-            groups_regions_rate.window_cropped()
+            sheets, groups, rate_data_unsmoothed_cropped,
+            groups_regions_rate_cropped
         )
         plotter.named_dmdt_all(
-            sheets, groups, rate_data_unsmoothed.window_cropped(),
-            groups_regions_rate.window_cropped(),
+            sheets, groups, rate_data_unsmoothed_cropped,
+            groups_regions_rate_cropped,
             sharex=True
         )
         # flipped grid versions
         plotter.named_dmdt_all(
-            sheets, groups, rate_data_unsmoothed.window_cropped(),
-            groups_regions_rate.window_cropped(), flip_grid=True, suffix="flipped"
+            sheets, groups, rate_data_unsmoothed_cropped,
+            groups_regions_rate_cropped, flip_grid=True, suffix="flipped"
         )
         plotter.named_dmdt_all(
-            sheets, groups, rate_data_unsmoothed.window_cropped(),
-            groups_regions_rate.window_cropped(),
+            sheets, groups, rate_data_unsmoothed_cropped,
+            groups_regions_rate_cropped,
             sharex=True, flip_grid=True, suffix="flipped"
         )
         for sheet in sheets:
             plotter.named_dmdt_all(
-                [sheet], groups, rate_data_unsmoothed.window_cropped(),
-                groups_regions_rate.window_cropped(), suffix=sheet.value
+                [sheet], groups, rate_data_unsmoothed_cropped,
+                groups_regions_rate_cropped, suffix=sheet.value
             )
             plotter.named_dmdt_all(
-                [sheet], groups, rate_data_unsmoothed.window_cropped(),
-                groups_regions_rate.window_cropped(), suffix=sheet.value, sharex=True
+                [sheet], groups, rate_data_unsmoothed_cropped,
+                groups_regions_rate_cropped, suffix=sheet.value, sharex=True
             )
     else:
         plotter.named_dmdt_all(
-            ais_sheets, groups, rate_data_unsmoothed.window_cropped(),
-            groups_regions_rate.smooth(config.plot_smooth_window, iters=config.plot_smooth_iters),
+            ais_sheets, groups, rate_data_unsmoothed_cropped,
+            groups_regions_rate_smooth,
             full_dmdt=rate_data_unsmoothed, suffix="ais"
         )
         plotter.named_dmdt_all(
-            ais_sheets, groups, rate_data_unsmoothed.window_cropped(),
-            groups_regions_rate.smooth(config.plot_smooth_window, iters=config.plot_smooth_iters),
+            ais_sheets, groups, rate_data_unsmoothed_cropped,
+            groups_regions_rate_smooth,
             full_dmdt=rate_data_unsmoothed, sharex=True, suffix="ais"
         )
         plotter.named_dmdt_all(
-            sheets, groups, rate_data_unsmoothed.window_cropped(),
-            groups_regions_rate.smooth(config.plot_smooth_window, iters=config.plot_smooth_iters),
+            sheets, groups, rate_data_unsmoothed_cropped,
+            groups_regions_rate_smooth,
             full_dmdt=rate_data_unsmoothed,
         )
         plotter.named_dmdt_all(
-            sheets, groups, rate_data_unsmoothed.window_cropped(),
-            groups_regions_rate.smooth(config.plot_smooth_window, iters=config.plot_smooth_iters),
+            sheets, groups, rate_data_unsmoothed_cropped,
+            groups_regions_rate_smooth,
             full_dmdt=rate_data_unsmoothed, sharex=True
         )
         # grid flipped version
         plotter.named_dmdt_all(
-            sheets, groups, rate_data_unsmoothed.window_cropped(),
-            groups_regions_rate.smooth(config.plot_smooth_window, iters=config.plot_smooth_iters),
+            sheets, groups, rate_data_unsmoothed_cropped,
+            groups_regions_rate_smooth,
             full_dmdt=rate_data_unsmoothed, flip_grid=True, suffix="flipped"
         )
         plotter.named_dmdt_all(
-            sheets, groups, rate_data_unsmoothed.window_cropped(),
-            groups_regions_rate.smooth(config.plot_smooth_window, iters=config.plot_smooth_iters),
+            sheets, groups, rate_data_unsmoothed_cropped,
+            groups_regions_rate_smooth,
             full_dmdt=rate_data_unsmoothed, sharex=True, flip_grid=True, suffix="flipped"
         )
         for sheet in sheets:
             plotter.named_dmdt_all(
-                [sheet], groups, rate_data_unsmoothed.window_cropped(),
-                groups_regions_rate.smooth(config.plot_smooth_window, iters=config.plot_smooth_iters),
+                [sheet], groups, rate_data_unsmoothed_cropped,
+                groups_regions_rate_smooth,
                 full_dmdt=rate_data_unsmoothed, suffix=sheet.value,
                 flip_grid=False
             )
             plotter.named_dmdt_all(
-                [sheet], groups, rate_data_unsmoothed.window_cropped(),
-                groups_regions_rate.smooth(config.plot_smooth_window, iters=config.plot_smooth_iters),
+                [sheet], groups, rate_data_unsmoothed_cropped,
+                groups_regions_rate_smooth,
                 full_dmdt=rate_data_unsmoothed, suffix=sheet.value,
                 sharex=True, flip_grid=False
             )
 
     for i, g in enumerate(groups):
         plotter.named_dmdt_all(
-            [IceSheet.gris], [g], rate_data_unsmoothed.window_cropped(),
+            [IceSheet.gris], [g], rate_data_unsmoothed_cropped,
             groups_regions_rate, full_dmdt=rate_data_unsmoothed, suffix='gris_%s' % g,
             t_range=(1990, 2020), tag=chr(ord('a')+i)
         )
     plotter.named_dmdt_all(
-        [IceSheet.gris], groups, rate_data_unsmoothed.window_cropped(),
-        groups_regions_rate.smooth(config.plot_smooth_window, iters=config.plot_smooth_iters),
+        [IceSheet.gris], groups, rate_data_unsmoothed_cropped,
+        groups_regions_rate_smooth,
         full_dmdt=rate_data_unsmoothed, suffix='gris_col', flip_grid=True #t_range=(1990, 2020),
     )
 
 
+    # the per-group and per-region plots are independent of each other, so
+    # they are collected and then drawn (optionally in parallel) together
+    group_plots = []
     for group in groups:
-        group_names = list({s.user for s in rate_data.filter(user_group=group)})
-        group_colors = style.UsersColorCollection(group_names)
+        group_rate = rate_data_by_group[group]
 
-        plotter.group_rate_boxes(
-            rate_data.filter(user_group=group), {s: s for s in sheets}, suffix=group
-        )
+        group_plots.append((
+            plotter.group_rate_boxes,
+            (group_rate, _SHEET_REGIONS), dict(suffix=group)
+        ))
         # plotter.group_rate_intracomparison(
         #     groups_regions_rate.filter(user_group=group).window_cropped().smooth(config.plot_smooth_window),
         #     rate_data.filter(user_group=group).window_cropped().smooth(config.plot_smooth_window),
@@ -1222,16 +1468,21 @@ def process(input_data: Sequence[Union[MassRateCollection, MassChangeCollection,
         #         basis=groups_regions_mass.filter(user_group=group, basin_id=sheet).first()
         #     )
     # intercomparisons
-    for _id, region in regions.items():
+    regions_rate_smooth = regions_rate.window_cropped().smooth(
+        config.plot_smooth_window, iters=config.plot_smooth_iters
+    )
+    for _id, region in region_items:
         reg = {_id: region}
 
-        plotter.groups_rate_intercomparison(
-            regions_rate.window_cropped().smooth(config.plot_smooth_window, iters=config.plot_smooth_iters),
-            groups_regions_rate.smooth(config.plot_smooth_window, iters=config.plot_smooth_iters), reg
-        )
-        plotter.groups_mass_intercomparison(
-            regions_mass, groups_regions_mass, reg, align=align_dm
-        )
+        group_plots.append((
+            plotter.groups_rate_intercomparison,
+            (regions_rate_smooth, groups_regions_rate_smooth, reg), {}
+        ))
+        group_plots.append((
+            plotter.groups_mass_intercomparison,
+            (regions_mass, groups_regions_mass, reg), dict(align=align_dm)
+        ))
+    _run_plots(group_plots, config.plot_workers)
     # region comparisons
     ais_regions = [IceSheet.eais, IceSheet.wais, IceSheet.apis]
     all_regions = [IceSheet.ais, IceSheet.gris, IceSheet.all]
@@ -1262,19 +1513,19 @@ def process(input_data: Sequence[Union[MassRateCollection, MassChangeCollection,
         regions_rate = regions_rate.smooth(
             config.export_smoothing_window, iters=config.export_smoothing_iters
         )
+        regions_rate_by_id = _first_by(regions_rate, 'basin_id')
 
     # write data to files
 
+    folder = os.path.join(output_path, "groups_dmdt")
+    os.makedirs(folder, exist_ok=True)
+
     for region in regions:
         groups_data = groups_regions_rate.filter(basin_id=region)
 
-        folder = os.path.join(output_path, "groups_dmdt")
-        if not os.path.exists(folder):
-            os.makedirs(folder)
-
         fname = os.path.join(folder, region.value + ".csv")
 
-        with open(fname, 'w') as f:
+        with open(fname, 'w', buffering=1 << 20) as f:
             for series in groups_data:
                 if config.output_timestep is not None:
                     series = series.reduce(
@@ -1282,11 +1533,11 @@ def process(input_data: Sequence[Union[MassRateCollection, MassChangeCollection,
                         centre=config.output_offset,
                         interp=True
                     )
-                for line in zip(series.t, series.dmdt, series.errs):
-                    line = series.user_group + ", " + series.basin_id.value + ", " + ", ".join(["%.4f" % n for n in line]) + "\n"
-                    f.write(line)
+                # format all the rows of the series in a single call
+                prefix = series.user_group + ", " + series.basin_id.value
+                _savetxt_prefixed(f, prefix, series.t, series.dmdt, series.errs)
 
-        data = regions_rate.filter(basin_id=region).first()
+        data = regions_rate_by_id.get(region)
         if config.output_timestep is not None:
             data = data.reduce(
                 interval=config.output_timestep,
@@ -1296,13 +1547,13 @@ def process(input_data: Sequence[Union[MassRateCollection, MassChangeCollection,
         fname = os.path.join(output_path, region.value+".csv")
 
         print("exporting data:", fname, end="... ")
-        with open(fname, 'w') as f:
-            for line in zip(data.t, data.dmdt, data.errs):
-                line = ", ".join(["%.4f" % n for n in line]) + "\n"
-                f.write(line)
+        with open(fname, 'w', buffering=1 << 20) as f:
+            np.savetxt(
+                f, np.column_stack((data.t, data.dmdt, data.errs)), fmt="%.4f, %.4f, %.4f"
+            )
         print("done.")
 
-        data = regions_mass.filter(basin_id=region).first()
+        data = regions_mass_by_id.get(region)
         if config.output_timestep is not None:
             data = data.reduce(
                 interval=config.output_timestep,
@@ -1312,48 +1563,40 @@ def process(input_data: Sequence[Union[MassRateCollection, MassChangeCollection,
         fname = os.path.join(output_path, region.value+"_dm.csv")
 
         print("exporting data:", fname, end="... ")
-        with open(fname, 'w') as f:
-            for line in zip(data.t, data.mass, data.errs):
-                line = ", ".join(["%.4f" % n for n in line]) + "\n"
-                f.write(line)
+        with open(fname, 'w', buffering=1 << 20) as f:
+            np.savetxt(
+                f, np.column_stack((data.t, data.mass, data.errs)), fmt="%.4f, %.4f, %.4f"
+            )
         print("done.")
 
-    gris_data = rate_data.filter(basin_id=IceSheet.gris)
-    gris_avg = regions_rate.filter(basin_id=IceSheet.gris).first()
+    # the group & inter-group averages may have been smoothed for output
+    # above, so look up their greenland series again
+    groups_gris = groups_regions_rate.filter(basin_id=IceSheet.gris)
+    groups_gris_by_group = _first_by(groups_gris, 'user_group')
+    gris_avg = regions_rate_by_id.get(IceSheet.gris)
     
     for wend in range(2010, 2016):
         g = gris_data.get_window(2005, wend+1)
         print('%i-%i:' % (2005, wend), '%i/%i,' %(len(g), len(gris_data)), end=' ')
         
-        for gris_grp in groups_regions_rate.filter(basin_id=IceSheet.gris):
+        for gris_grp in groups_gris:
             gris_grp_w = gris_grp.truncate(2005, wend+1)
             print('%s:' % gris_grp_w.user_group, '%.2f,' % gris_grp_w.mean, '%.2f,' % gris_grp_w.sigma, end=' ')
         
         avg_w = gris_avg.truncate(2005, wend+1)
         print('AVG:', '%.2f,' % avg_w.mean, '%.2f' % avg_w.sigma)
 
-    groups_gris = groups_regions_rate.filter(basin_id=IceSheet.gris)
-
     #### IMBIE3 update: check for groups used in datasets, only cycle through those present 
 
     groups_present=[g.user_group for g in groups_gris]
     
     for g in groups_present:
-        t, g_sig1, tot = count_tolerance(
-            gris_data.filter(user_group=g),
-            groups_gris.filter(user_group=g).first(),
-            1
-        )
-        _, g_sig2, _ = count_tolerance(
-            gris_data.filter(user_group=g),
-            groups_gris.filter(user_group=g).first(),
-            2
-        )
-        _, g_sig3, _ = count_tolerance(
-            gris_data.filter(user_group=g),
-            groups_gris.filter(user_group=g).first(),
-            3
-        )
+        g_data = gris_data.filter(user_group=g)
+        g_avg = groups_gris_by_group[g]
+
+        t, g_sig1, tot = count_tolerance(g_data, g_avg, 1)
+        _, g_sig2, _ = count_tolerance(g_data, g_avg, 2)
+        _, g_sig3, _ = count_tolerance(g_data, g_avg, 3)
         ok = tot > 0
         sig1_avg = np.mean(g_sig1[ok] / tot[ok])
         sig2_avg = np.mean(g_sig2[ok] / tot[ok])
@@ -1409,21 +1652,15 @@ def process(input_data: Sequence[Union[MassRateCollection, MassChangeCollection,
 
     # produce extended data table 3
 
-    data_window = rate_data.filter(
-        basin_id=IceSheet.gris
-    ).get_window(
+    data_window = gris_data.get_window(
         config.bar_plot_min_time, config.bar_plot_max_time, interp=False
     )
 
-    avgs_window = groups_regions_rate.filter(
-        basin_id=IceSheet.gris
-    ).get_window(
+    avgs_window = groups_gris.get_window(
         config.bar_plot_min_time, config.bar_plot_max_time, interp=False
     )
 
-    xavg_window = regions_rate.filter(
-        basin_id=IceSheet.gris
-    ).get_window(
+    xavg_window = regions_rate.filter(basin_id=IceSheet.gris).get_window(
         config.bar_plot_min_time, config.bar_plot_max_time, interp=False
     )
 
@@ -1435,7 +1672,7 @@ def process(input_data: Sequence[Union[MassRateCollection, MassChangeCollection,
         'ALL': 'All'
     }
 
-    fpath = os.path.join(config.output_path, 'ext_table_3.csv')
+    fpath = os.path.join(output_path, 'ext_table_3.csv')
     with open(fpath, 'w') as f:
         f.write('Technique,Mass balance (Gt/yr),s.d. (Gt/yr),Range (Gt/yr)\n')
 
@@ -1455,7 +1692,7 @@ def process(input_data: Sequence[Union[MassRateCollection, MassChangeCollection,
                 avg_mean=avg.mean
                 avg_sigma=avg.sigma
 
-                grid = np.empty((avg.t.size, len(group_data))) * np.nan
+                grid = np.full((avg.t.size, len(group_data)), np.nan)
 
                 for i, s in enumerate(group_data):
                     s_dmdt = np.interp(avg.t, s.t, s.dmdt, left=np.nan, right=np.nan)
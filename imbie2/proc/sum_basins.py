@@ -2,6 +2,7 @@ from imbie2.model.collections.collection import Collection
 from imbie2.const.error_methods import ErrorMethod
 from imbie2.const.basins import BasinGroup, ZwallyBasin, RignotBasin, IceSheet
 from typing import Iterable
+from collections import defaultdict
 
 
 def sum_basins(data: Collection, sheets: Iterable[IceSheet]=None) -> None:
@@ -17,23 +18,38 @@ def sum_basins(data: Collection, sheets: Iterable[IceSheet]=None) -> None:
     if sheets is None:
         sheets = [IceSheet.eais, IceSheet.wais, IceSheet.apis, IceSheet.gris]
 
-    users = list({s.user for s in data})
-    for user in users:
-        user_data = data.filter(user=user)
-        for group, basin_set in zip([BasinGroup.zwally, BasinGroup.rignot], [ZwallyBasin, RignotBasin]):
-            for sheet in sheets:
-                basins = list(basin_set.sheet(sheet))
-                sheet_data = user_data.filter(basin_id=basins)
-
-                if user_data.filter(basin_id=sheet, basin_group=group):
-                    continue
-
-                if len(sheet_data) == len(basins):
-                    series = sheet_data.sum(error_method=ErrorMethod.rss)
-
-                    series.basin_id = sheet
-                    series.basin_group = group
-                    series.user = user
-                    series.aggregated = True
-
-                    data.add_series(series)
+    # the basins making up each sheet depend only on the basin group, so
+    # build them (and a set for membership tests) once up front
+    basin_table = {}
+    for group, basin_set in zip([BasinGroup.zwally, BasinGroup.rignot], [ZwallyBasin, RignotBasin]):
+        for sheet in sheets:
+            basins = basin_set.sheet(sheet)
+            basin_table[group, sheet] = basins, set(basins)
+
+    # group the series by user in a single pass
+    by_user = defaultdict(list)
+    for series in data:
+        by_user[series.user].append(series)
+
+    for user, user_series in by_user.items():
+        # the (location, basin group) pairs already provided by this user
+        present = {(s.basin_id, s.basin_group) for s in user_series}
+
+        for group, sheet in basin_table:
+            if (sheet, group) in present:
+                continue
+
+            basins, basin_ids = basin_table[group, sheet]
+            sheet_data = data.__class__(
+                *[s for s in user_series if s.basin_id in basin_ids]
+            )
+
+            if len(sheet_data) == len(basins):
+                series = sheet_data.sum(error_method=ErrorMethod.rss)
+
+                series.basin_id = sheet
+                series.basin_group = group
+                series.user = user
+                series.aggregated = True
+
+                data.add_series(series)
@@ -138,6 +138,10 @@ class Table(PrettyTable):
 
         :param data: the input data collection
         """
+        # filter the data once per primary value, and share the
+        # results between all of the automatic columns
+        items = list(self._retreive_primary(data))
+
         for name, func in self._auto_cols.items():
-            col = [func(item) for item in self._retreive_primary(data)]
+            col = [func(item) for item in items]
             self.add_column(name, col)
@@ -105,9 +105,10 @@ def weighted_combine(t, y, w=None, nsigma=None, average=False,
                 y1[m1] += (y2[m2] * w2[m2])
             else:
                 y1[m1] += (y2[m2] * w2[m2]) ** 2.
-        except IndexError:
-            print(m1, m2)
-            raise
+        except IndexError as e:
+            raise IndexError(
+                "mismatched indices combining series {}: {}, {}".format(i, m1, m2)
+            ) from e
         data_out[m1, i] = y2[m2]
         # increment the values in c1 for each current point
         c1[m1] += w2[m2]
@@ -4,7 +4,6 @@ from imbie2.model.collections import WorkingMassRateCollection
 from imbie2.model.series import WorkingMassRateDataSeries
 
 from .functions import ts2m
-import matplotlib.pyplot as plt
 
 
 def count_tolerance(data: WorkingMassRateCollection, guide: WorkingMassRateDataSeries, nsigma: int=1) -> np.ndarray:
@@ -12,7 +11,7 @@ def count_tolerance(data: WorkingMassRateCollection, guide: WorkingMassRateDataS
     create series counting number of contributions within
     nsigma tolerance of the guide series at each epoch
     """
-    counts = np.zeros(guide.dmdt.shape, dtype=np.int)
+    counts = np.zeros(guide.dmdt.shape, dtype=np.int64)
     tot = np.zeros_like(counts)
 
     for series in data:      
@@ -1,20 +1,38 @@
 import numpy as np
 
 from imbie2.model.series import WorkingMassRateDataSeries
-from imbie2.util.functions import match, ts2m
+from imbie2.util.functions import match, ts2m_multi
+from typing import List, Sequence
 
 
 def calculate_discharge(mass_balance: WorkingMassRateDataSeries, surface_mass_balance: WorkingMassRateDataSeries) -> WorkingMassRateDataSeries:
-    t_smb, dmdt_smb = ts2m(surface_mass_balance.t, surface_mass_balance.dmdt)
-    _, errs_smb = ts2m(surface_mass_balance.t, surface_mass_balance.errs)
+    return calculate_discharges([mass_balance], surface_mass_balance)[0]
 
-    t_mb, dmdt_mb = ts2m(mass_balance.t, mass_balance.dmdt)
-    _, errs_mb = ts2m(mass_balance.t, mass_balance.errs)
+
+def calculate_discharges(mass_balances: Sequence[WorkingMassRateDataSeries],
+                         surface_mass_balance: WorkingMassRateDataSeries) -> List[WorkingMassRateDataSeries]:
+    """
+    calculates the discharge for each of several mass balance series
+    against the same surface mass balance series, which is only
+    resampled to monthly values once
+    """
+    t_smb, dmdt_smb, errs_smb = ts2m_multi(
+        surface_mass_balance.t, surface_mass_balance.dmdt, surface_mass_balance.errs
+    )
+    return [
+        _discharge(mass_balance, t_smb, dmdt_smb, errs_smb) for mass_balance in mass_balances
+    ]
+
+
+def _discharge(mass_balance: WorkingMassRateDataSeries, t_smb: np.ndarray, dmdt_smb: np.ndarray,
+               errs_smb: np.ndarray) -> WorkingMassRateDataSeries:
+    t_mb, dmdt_mb, errs_mb = ts2m_multi(mass_balance.t, mass_balance.dmdt, mass_balance.errs)
 
     i_smb, i_mb = match(t_smb, t_mb, epsilon=1./24.)
 
     discharge_t = t_smb[i_smb]
-    discharge_rate = dmdt_mb[i_mb] - dmdt_smb[i_smb]
+    discharge_rate = dmdt_mb[i_mb]
+    discharge_rate -= dmdt_smb[i_smb]
     discharge_errs = np.sqrt(
         errs_mb[i_mb] ** 2 + errs_smb[i_smb] ** 2
     )
@@ -24,4 +42,4 @@ def calculate_discharge(mass_balance: WorkingMassRateDataSeries, surface_mass_ba
         mass_balance.basin_id, mass_balance.basin_area, discharge_t, mass_balance.a,
         discharge_rate, discharge_errs, mass_balance.computed, mass_balance.merged, 
         mass_balance.aggregated, mass_balance.contributions, mass_balance.trunc_extent
-    )
\ No newline at end of file
+    )
@@ -72,8 +72,8 @@ def dm_to_dmdt(
         tout = t
 
     # create empty data structures
-    dmdt = np.empty(tout.shape, dtype=t.dtype) * np.nan
-    sigma_dmdt = np.empty(tout.shape, dtype=t.dtype) * np.nan
+    dmdt = np.full(tout.shape, np.nan, dtype=t.dtype)
+    sigma_dmdt = np.full(tout.shape, np.nan, dtype=t.dtype)
     model_fit_t = [None for _ in tout]
     model_fit_dm = [None for _ in tout]
     n_records_fitting = [0 for _ in tout]
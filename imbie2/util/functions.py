@@ -1,4 +1,3 @@
-from matplotlib import pyplot as plt
 import numpy as np
 from scipy import interpolate, stats, optimize
 import math
@@ -13,13 +12,13 @@ def match(a, b, epsilon=0):
     >>> a = [3, 5, 7, 9, 11]
     >>> b = [5, 6, 7, 8, 9, 10]
     >>> ai, bi = match(a, b)
-    >>> print ai
+    >>> print(ai)
     [1, 2, 3]
-    >>> print bi
+    >>> print(bi)
     [0, 2, 4]
-    >>> print a[ai]
+    >>> print(a[ai])
     [5, 7, 9]
-    >>> print b[bi]
+    >>> print(b[bi])
     [5, 7, 9]
 
     N.B: This assumes that there are no duplicate values in 'a' or 'b'.
@@ -184,15 +183,82 @@ def ts2m(x, y):
     return xnew, ynew
 
 
+def ts2m_multi(x, *ys):
+    """
+    resamples several series which share the same x (time) values
+    into monthly data points, as per 'ts2m'.
+
+    The monthly time-values and the nearest-neighbour lookup are
+    computed once, and then applied to each of the input y series.
+
+    INPUTS:
+        x: The x (time) values of the input series
+        *ys: The y values of each of the input series
+    OUTPUTS:
+        xnew: The monthly time-values of the output series
+        *ynew: The resampled y-values of each input series
+    """
+    x0 = math.floor(np.min(x) * 12) / 12.
+    x1 = math.ceil(np.max(x) * 12) / 12.
+    xnew = np.arange((x1 - x0)*12, dtype=x.dtype) / 12. + x0
+
+    s = interpolate.interp1d(
+        x, np.vstack(ys), kind='nearest', fill_value="extrapolate", axis=1
+    )
+    return (xnew, *s(xnew))
+
+
+def nearest_align(target_t, src_t, *src_vals, tol=np.inf):
+    """
+    aligns one or more series to new time-values, by taking the
+    value at the nearest point in time (within a tolerance).
+
+    This matches pandas' reindex(method='nearest', tolerance=tol):
+    ties go to the later point, and values with no match within
+    the tolerance are set to NaN.
+
+    INPUTS:
+        target_t: The time-values to align to
+        src_t: The (monotonic increasing) time-values of the input series
+        *src_vals: The values of each of the input series
+        tol: (optional) the maximum time difference of a match
+    OUTPUTS:
+        *vals: The aligned values of each input series
+    """
+    target_t = np.asarray(target_t)
+    src_t = np.asarray(src_t)
+    n = len(src_t)
+    if n == 0:
+        # nothing to align from, so no value has a match
+        return tuple(np.full(target_t.shape, np.nan) for _ in src_vals)
+
+    # indices of the nearest earlier & later points
+    left = np.searchsorted(src_t, target_t, side='right') - 1
+    right = np.searchsorted(src_t, target_t, side='left')
+    l = np.clip(left, 0, n - 1)
+    r = np.clip(right, 0, n - 1)
+
+    with np.errstate(invalid='ignore'):
+        dl = np.where(left >= 0, np.abs(src_t[l] - target_t), np.inf)
+        dr = np.where(right < n, np.abs(src_t[r] - target_t), np.inf)
+    use_left = dl < dr
+    pick = np.where(use_left, l, r)
+    ok = np.where(use_left, dl, dr) <= tol
+
+    return tuple(
+        np.where(ok, np.asarray(vals, dtype=np.float64)[pick], np.nan) for vals in src_vals
+    )
+
+
 def lag_correlate(t1, y1, t2, y2, n=13, return_lag=False):
     """computes the cross-correlation of the inputs y1(t1) and y2(t2)"""
-    n = (n / 2) * 2 + 1
+    n = (n // 2) * 2 + 1
     c = np.arange(n, dtype=float)
 
     t1i = t2m(t1, pad=False)
     t2i = t2m(t2, pad=False)
 
-    for i in range(-n/2, n/2):
+    for i in range(-n // 2, n // 2):
         m1, m2 = match(t1i, t2i + i/12.)
 
         y1m = y1[m1]
@@ -202,13 +268,13 @@ def lag_correlate(t1, y1, t2, y2, n=13, return_lag=False):
             np.isfinite(y2m)
         )
 
-        c[i + n/2 + 1], _ = stats.pearsonr(y1m[ok], y2m[ok])
+        c[i + n // 2 + 1], _ = stats.pearsonr(y1m[ok], y2m[ok])
     cc = interpol(np.arange(n), c, np.arange(n*100)/100., mode="spline")
     # cc = interpol(c, np.arange(n), np.arange(n*100)/100.)
     cmax = np.max(cc)
     if return_lag:
         maxpos = np.argmax(cc)
-        lag = maxpos/100. - n/2
+        lag = maxpos/100. - n // 2
         return cmax, lag
     return cmax
 
@@ -345,6 +411,23 @@ def rmsd(a, b):
     return np.mean(np.power(a-b, 2)) ** .5
 
 
+def nanrms(x):
+    """
+    returns the root-mean-square of the sequence 'x', ignoring NaNs.
+
+    The sum of squares is taken as a single dot product, so no
+    squared copy of 'x' is created.
+
+    INPUTS:
+        x: The sequence of values
+    OUTPUTS:
+        the RMS of the non-NaN values of 'x'
+    """
+    x = np.asarray(x)
+    x = x[~np.isnan(x)]
+    return math.sqrt(np.dot(x, x) / x.size)
+
+
 def get_offset(t1, y1, t2, y2):
     """returns the offset between two data series"""
     ok = np.logical_and(
@@ -402,6 +485,7 @@ def ts_combine(t, y, nsigma=0, error=False, average=False, verbose=False, ret_da
     """
     colors = ['r', 'g', 'b', 'c', 'y', 'm', 'o', 'k']
     if verbose:
+        import matplotlib.pyplot as plt
         for ti, yi, c in zip(t, y, colors[1:]):
             plt.plot(ti, yi, c+'-')
     # create _id array, which indicates which input array each element originated from
@@ -594,6 +678,7 @@ def fit_imbie2(t1, m1, t2, m2, t3, dmdt3, t4, dmdt4, verbose=False):
     m = 2. * (Sx1y1 + Sx2y2 + Sy3 + Sy4 - 2. * Sy1 - 2. * Sy2) /\
              (Sx12 + Sx22 + 2. + 4. * Sx1 + 4. * Sx2)
     if verbose:
+        import matplotlib.pyplot as plt
         plt.plot(t1, m1, t3, np.cumsum(dmdt3),
                  t2, m2, t4, np.cumsum(dmdt4))
         plt.show()
@@ -641,6 +726,7 @@ def fit_imbie3(t1, m1, t2, m2, t3, m3, t4, m4, verbose=False, full=False):
     c4 = (Sy4 - m * Sx4) / n4
 
     if verbose:
+        import matplotlib.pyplot as plt
         plt.plot(
             t1, m1 - c1,
             t2, m2 - c2,
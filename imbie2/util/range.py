@@ -11,9 +11,9 @@ def calc_range(coll: WorkingMassRateCollection):
     s_year = np.floor(min([s.min_time for s in coll]))
     e_year = np.ceil(max([s.max_time for s in coll]))
 
-    years = np.arange(s_year, e_year, 1, dtype=np.float) + .5
-    max_ = np.empty_like(years) * np.nan
-    min_ = np.empty_like(years) * np.nan
+    years = np.arange(s_year, e_year, 1, dtype=np.float64) + .5
+    max_ = np.full_like(years, np.nan)
+    min_ = np.full_like(years, np.nan)
 
     for i, y in enumerate(years):
         for s in coll:
@@ -36,7 +36,7 @@ def calc_sd(coll: WorkingMassRateCollection):
     s_year = np.floor(min([s.min_time for s in coll]))
     e_year = np.ceil(max([s.max_time for s in coll]))
 
-    years = np.arange(s_year, e_year, 1, dtype=np.float) + .5
+    years = np.arange(s_year, e_year, 1, dtype=np.float64) + .5
     vals = np.empty_like(years)
 
     for i, y in enumerate(years):
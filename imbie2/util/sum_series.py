@@ -1,5 +1,4 @@
-from .combine import weighted_combine as ts_combine
-from .functions import ts2m, match
+from .functions import ts2m, match, t2m
 
 import numpy as np
 
@@ -8,7 +7,9 @@ def sum_series(ts, data, ret_mask=False):
     if len(ts) == 1:
         return ts[0], data[0]
 
-    t, _ = ts_combine(ts, data)
+    # the monthly time-axis spanned by all the inputs, as per 'weighted_combine' (the
+    # combined values themselves are not needed, so the full combine is skipped)
+    t = np.unique(t2m(np.sort(np.concatenate(ts))))
     out = np.zeros(t.shape, dtype=np.float64)
 
     beg_t = np.min(ts[0])
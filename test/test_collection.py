@@ -0,0 +1,42 @@
+import unittest
+
+import numpy as np
+
+from imbie2.const.basins import BasinGroup, IceSheet
+from imbie2.model.collections import WorkingMassRateCollection
+from imbie2.model.series import WorkingMassRateDataSeries
+
+
+class TestFilter(unittest.TestCase):
+
+    def setUp(self):
+        t = np.arange(1992., 2010., 1. / 12)
+        dmdt = np.full(t.shape, -80.)
+        errs = np.full(t.shape, 10.)
+
+        self.data = WorkingMassRateCollection()
+        for user, group, sheet in [("li", "RA", IceSheet.wais),
+                                   ("oliveira", "RA", IceSheet.wais),
+                                   ("smith", "GMB", IceSheet.eais)]:
+            self.data.add_series(WorkingMassRateDataSeries(
+                user, group, group, BasinGroup.sheets, sheet, 1., t, None, dmdt, errs
+            ))
+
+    def _users(self, collection: WorkingMassRateCollection) -> list:
+        return [series.user for series in collection]
+
+    def test_str_matches_whole_value(self):
+        self.assertEqual(self._users(self.data.filter(user="li")), ["li"])
+        self.assertEqual(self._users(self.data.filter(user="olive")), [])
+
+    def test_sequence_matches_any_item(self):
+        self.assertEqual(
+            self._users(self.data.filter(user=["li", "smith"])), ["li", "smith"]
+        )
+
+    def test_combined_keys(self):
+        self.assertEqual(
+            self._users(self.data.filter(user_group="RA", basin_id=IceSheet.wais)),
+            ["li", "oliveira"]
+        )
+        self.assertEqual(len(self.data.filter(user_group=None)), 0)
@@ -0,0 +1,121 @@
+import math
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from imbie2.util.functions import nanrms, nearest_align, ts2m, ts2m_multi
+
+
+def _reindexed(target_t: np.ndarray, src_t: np.ndarray, src_vals: np.ndarray, tol: float) -> np.ndarray:
+    """
+    the pandas reindex that nearest_align replaced
+    """
+    return pd.Series(src_vals, index=src_t, dtype=np.float64).reindex(
+        target_t, method='nearest', tolerance=tol
+    ).values
+
+
+class TestNearestAlign(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        self.src_t = np.sort(rng.rand(60) * 10. + 2000.)
+        self.dmdt = rng.randn(60)
+        self.errs = np.abs(rng.randn(60))
+
+    def _check(self, target_t: np.ndarray, tol: float):
+        dmdt, errs = nearest_align(target_t, self.src_t, self.dmdt, self.errs, tol=tol)
+
+        np.testing.assert_array_equal(dmdt, _reindexed(target_t, self.src_t, self.dmdt, tol))
+        np.testing.assert_array_equal(errs, _reindexed(target_t, self.src_t, self.errs, tol))
+
+    def test_matches_reindex(self):
+        target_t = np.arange(1999., 2011., 1. / 12)
+        for tol in (1. / 24, .5, np.inf):
+            self._check(target_t, tol)
+
+    def test_ties(self):
+        # points half-way between two source points go to the later one
+        self._check((self.src_t[:-1] + self.src_t[1:]) / 2., 1. / 24)
+        self._check(self.src_t, 0.)
+
+    def test_unsorted_target(self):
+        target_t = np.random.RandomState(1).rand(100) * 12. + 1999.
+        self._check(target_t, 1. / 24)
+
+    def test_nan_values(self):
+        self.dmdt[[0, 10, 11]] = np.nan
+        target_t = np.arange(1999., 2011., 1. / 12)
+        target_t[[3, 50]] = np.nan
+        self._check(target_t, 1. / 24)
+
+    def test_empty(self):
+        dmdt, = nearest_align(np.array([]), self.src_t, self.dmdt, tol=1.)
+        self.assertEqual(dmdt.shape, (0,))
+
+        target_t = np.arange(2000., 2001., 1. / 12)
+        dmdt, = nearest_align(target_t, np.array([]), np.array([]), tol=1.)
+        np.testing.assert_array_equal(dmdt, _reindexed(target_t, [], [], 1.))
+
+
+class TestTs2mMulti(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        self.x = np.sort(rng.rand(40) * 5. + 2000.)
+        self.ys = [rng.randn(40), np.abs(rng.randn(40))]
+
+    def _check(self, x: np.ndarray, *ys: np.ndarray):
+        xnew, *ynews = ts2m_multi(x, *ys)
+
+        for y, ynew in zip(ys, ynews):
+            xm, ym = ts2m(x, y)
+            np.testing.assert_array_equal(xnew, xm)
+            np.testing.assert_array_equal(ynew, ym)
+
+    def test_matches_ts2m(self):
+        self._check(self.x, *self.ys)
+        self._check(self.x, self.ys[0])
+
+    def test_unsorted_times(self):
+        order = np.random.RandomState(1).permutation(self.x.size)
+        self._check(self.x[order], *[y[order] for y in self.ys])
+
+    def test_nan_values(self):
+        self.ys[0][[0, 5, 6]] = np.nan
+        self._check(self.x, *self.ys)
+
+    def test_empty(self):
+        with self.assertRaises(ValueError):
+            ts2m(np.array([]), np.array([]))
+        with self.assertRaises(ValueError):
+            ts2m_multi(np.array([]), np.array([]))
+
+
+class TestNanRms(unittest.TestCase):
+
+    @staticmethod
+    def _rms(x: np.ndarray) -> float:
+        """
+        the expression that nanrms replaced
+        """
+        return math.sqrt(np.nanmean(np.square(x)))
+
+    def test_matches_nanmean(self):
+        x = np.random.RandomState(0).randn(1000) * 5.
+        self.assertAlmostEqual(nanrms(x), self._rms(x), places=12)
+
+    def test_nan_values(self):
+        x = np.random.RandomState(0).randn(100)
+        x[[1, 20, 21]] = np.nan
+        self.assertAlmostEqual(nanrms(x), self._rms(x), places=12)
+
+    def test_empty(self):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.assertTrue(math.isnan(nanrms(np.array([]))))
+            self.assertTrue(math.isnan(nanrms(np.array([np.nan, np.nan]))))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+
+import numpy as np
+
+from imbie2.const.basins import BasinGroup, IceSheet
+from imbie2.model.series import MassChangeDataSeries
+
+
+class TestLimitTimes(unittest.TestCase):
+
+    def _series(self, t: np.ndarray) -> MassChangeDataSeries:
+        mass = np.arange(t.size, dtype=np.float64)
+        return MassChangeDataSeries(
+            "user", "RA", "RA", BasinGroup.sheets, IceSheet.wais, 1., t, None, mass, mass / 10.,
+            interpolate=False
+        )
+
+    def _check(self, t: np.ndarray, min_t: float, max_t: float):
+        series = self._series(t)
+        series.limit_times(min_t, max_t)
+
+        ok = (t >= min_t) & (t <= max_t)
+        np.testing.assert_array_equal(series.t, t[ok])
+        np.testing.assert_array_equal(series.mass, np.arange(t.size)[ok])
+        np.testing.assert_array_equal(series.errs, np.arange(t.size)[ok] / 10.)
+
+    def test_sorted(self):
+        self._check(np.arange(2000., 2010., .25), 2002., 2005.5)
+
+    def test_repeated_epochs(self):
+        self._check(np.array([2000., 2001., 2001., 2002., 2002., 2003.]), 2001., 2002.)
+
+    def test_unsorted(self):
+        self._check(np.array([2003., 2000., 2002., 2005., 2001.]), 2001., 2003.)
+
+    def test_nan_epochs(self):
+        self._check(np.array([2000., np.nan, 2002., 2003., np.nan, 2005.]), 2001., 2004.)
@@ -0,0 +1,76 @@
+import multiprocessing
+import os
+import pickle
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+matplotlib.use("Agg")
+import numpy as np
+
+from imbie2.const.basins import BasinGroup, IceSheet
+from imbie2.model.series import WorkingMassRateDataSeries
+from imbie2.plot.plotter import Plotter
+
+
+def _read_plot(path: str) -> bytes:
+    fname = os.path.join(path, "single", "rate", "single_rate_plot_user_wais.png")
+    with open(fname, "rb") as f:
+        return f.read()
+
+
+class TestPlotterPickling(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        t = np.arange(1992., 2015., 1. / 12)
+        self.series = WorkingMassRateDataSeries(
+            "user", "RA", "RA", BasinGroup.sheets, IceSheet.wais, 1.,
+            t, None, -80. + rng.randn(t.size) * 10., np.abs(rng.randn(t.size)) + 5.
+        )
+        self.rc = matplotlib.rc_context()
+        self.rc.__enter__()
+
+    def tearDown(self):
+        self.rc.__exit__(None, None, None)
+
+    def _render_both_ways(self, change_rc: bool=False):
+        with tempfile.TemporaryDirectory() as serial_path, \
+             tempfile.TemporaryDirectory() as pooled_path:
+            serial = Plotter(filetype="png", path=serial_path)
+            pooled = Plotter(filetype="png", path=pooled_path)
+            if change_rc:
+                matplotlib.rc('axes', grid=True)
+                matplotlib.rc('grid', linewidth=3)
+
+            serial.single_rate_plot(self.series)
+
+            # 'spawn' starts each worker without the state of this process,
+            # so the plotter has to carry everything it needs
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                executor.submit(pooled.single_rate_plot, self.series).result()
+
+            return _read_plot(serial_path), _read_plot(pooled_path)
+
+    def test_round_trip(self):
+        plotter = Plotter(filetype="png")
+        plotter.clear_plot()
+        copy = pickle.loads(pickle.dumps(plotter))
+
+        self.assertFalse(hasattr(copy, "fig"))
+        self.assertEqual(copy._path, plotter._path)
+        self.assertEqual(copy._ext, plotter._ext)
+
+    def test_worker_matches_serial(self):
+        serial, pooled = self._render_both_ways()
+        self.assertEqual(serial, pooled)
+
+    def test_worker_keeps_rc_changes(self):
+        serial, pooled = self._render_both_ways(change_rc=True)
+        self.assertEqual(serial, pooled)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+import math
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from imbie2.const.average_methods import AverageMethod
+from imbie2.const.basins import BasinGroup, IceSheet
+from imbie2.const.error_methods import ErrorMethod
+from imbie2.model.series import WorkingMassRateDataSeries
+from imbie2.proc.process import _average_series, _reuse_mass, window_stats
+
+
+def _make_series(rng: np.random.RandomState, user: str, start: float) -> WorkingMassRateDataSeries:
+    t = np.arange(start, 2015., 1. / 12)
+    dmdt = -80. + rng.randn(t.size) * 10.
+    errs = np.abs(rng.randn(t.size)) * 5. + 5.
+    return WorkingMassRateDataSeries(
+        user, "RA", "RA", BasinGroup.sheets, IceSheet.wais, 1., t, None, dmdt, errs
+    )
+
+
+class TestAverageSeries(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        self.groups = [
+            [_make_series(rng, "user_%i_%i" % (i, j), 1992. + i + j * .4) for j in range(3)]
+            for i in range(4)
+        ]
+        self.args = (AverageMethod.equal_groups, ErrorMethod.rms, None)
+
+    def test_pooled_matches_serial(self):
+        serial = [_average_series(series, *self.args) for series in self.groups]
+
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            futures = [
+                executor.submit(_average_series, series, *self.args) for series in self.groups
+            ]
+            pooled = [future.result() for future in futures]
+
+        for (expected, expected_log), (actual, actual_log) in zip(serial, pooled):
+            np.testing.assert_array_equal(actual.t, expected.t)
+            np.testing.assert_array_equal(actual.dmdt, expected.dmdt)
+            np.testing.assert_array_equal(actual.errs, expected.errs)
+            self.assertEqual(actual_log, expected_log)
+
+
+def _truncated_stats(t: np.ndarray, dmdt: np.ndarray, errs: np.ndarray, w0: float, w1: float) -> tuple:
+    """
+    the mean & sigma of series.truncate(w0, w1, interp=False), as computed
+    before window_stats replaced it
+    """
+    if not w0 < t.min():
+        ok = t >= w0
+        t, dmdt, errs = t[ok], dmdt[ok], errs[ok]
+    if not w1 > t.max():
+        ok = t < w1
+        t, dmdt, errs = t[ok], dmdt[ok], errs[ok]
+    sigma = math.sqrt(np.nanmean(np.square(errs))) / np.sqrt(t.max() - t.min())
+    return np.nanmean(dmdt), sigma
+
+
+class TestWindowStats(unittest.TestCase):
+
+    windows = [
+        (1992., 1997.), (1995.5, 2003.25), (2000., 2000.5),
+        (2001. + 1. / 12, 2004.), (1980., 2030.), (2010., 2030.)
+    ]
+
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        self.t = np.arange(1993., 2015., 1. / 12)
+        self.dmdt = -80. + rng.randn(self.t.size) * 10.
+        self.errs = np.abs(rng.randn(self.t.size)) * 5. + 5.
+
+    def _series(self, t: np.ndarray, dmdt: np.ndarray, errs: np.ndarray) -> WorkingMassRateDataSeries:
+        return WorkingMassRateDataSeries(
+            "user", "RA", "RA", BasinGroup.sheets, IceSheet.gris, 1., t, None, dmdt, errs
+        )
+
+    def _check(self, t: np.ndarray, dmdt: np.ndarray, errs: np.ndarray):
+        means, sigmas = window_stats(self._series(t, dmdt, errs), self.windows)
+
+        for i, (w0, w1) in enumerate(self.windows):
+            mean, sigma = _truncated_stats(t, dmdt, errs, w0, w1)
+            np.testing.assert_allclose(means[i], mean, rtol=1e-12)
+            np.testing.assert_allclose(sigmas[i], sigma, rtol=1e-12)
+
+    def test_matches_truncate(self):
+        self._check(self.t, self.dmdt, self.errs)
+
+    def test_nan_values(self):
+        self.dmdt[[5, 40, 41]] = np.nan
+        self.errs[[7, 100]] = np.nan
+        self._check(self.t, self.dmdt, self.errs)
+
+    def test_unsorted_times(self):
+        order = np.random.RandomState(1).permutation(self.t.size)
+        self._check(self.t[order], self.dmdt[order], self.errs[order])
+
+    def test_nan_times(self):
+        self.t[[0, 50, 51]] = np.nan
+        self._check(self.t, self.dmdt, self.errs)
+
+    def test_empty_windows(self):
+        # truncate() raised for these, as the truncated series is empty
+        t = np.hstack((self.t[:24], self.t[60:]))
+        dmdt = np.hstack((self.dmdt[:24], self.dmdt[60:]))
+        errs = np.hstack((self.errs[:24], self.errs[60:]))
+        windows = [(1970., 1980.), (2020., 2030.), (1995.5, 1997.5)]
+
+        means, sigmas = window_stats(self._series(t, dmdt, errs), windows)
+        self.assertTrue(np.isnan(means).all())
+        self.assertTrue(np.isnan(sigmas).all())
+
+        means, sigmas = window_stats(self._series(t[:0], dmdt[:0], errs[:0]), windows)
+        self.assertTrue(np.isnan(means).all())
+        self.assertTrue(np.isnan(sigmas).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+class TestReuseMass(unittest.TestCase):
+
+    def setUp(self):
+        self.rate = _make_series(np.random.RandomState(0), "user", 1992.)
+        self.mass = self.rate.integrate()
+        self.mass_by_rate = {id(self.rate): self.mass}
+
+    def test_returns_copy(self):
+        reused = _reuse_mass(self.mass_by_rate, self.rate)
+
+        self.assertIsNot(reused, self.mass)
+        self.assertEqual(reused.basin_id, self.rate.basin_id)
+        np.testing.assert_array_equal(reused.t, self.mass.t)
+        np.testing.assert_array_equal(reused.mass, self.mass.mass)
+        np.testing.assert_array_equal(reused.errs, self.mass.errs)
+
+        # changes to the region's series don't reach the sheet's series
+        mass = self.mass.mass.copy()
+        reused.mass += 1.
+        reused.limit_times(2000., 2005.)
+        np.testing.assert_array_equal(self.mass.mass, mass)
+        self.assertEqual(self.mass.t.size, mass.size)
+
+    def test_relabelled_rate(self):
+        self.rate.basin_id = IceSheet.eais
+        self.assertIsNone(_reuse_mass(self.mass_by_rate, self.rate))
+
+    def test_unknown_rate(self):
+        self.assertIsNone(_reuse_mass({}, self.rate))
@@ -0,0 +1,71 @@
+import unittest
+import warnings
+
+import numpy as np
+
+from imbie2.const.basins import BasinGroup, IceSheet
+from imbie2.model.series import WorkingMassRateDataSeries
+
+
+class TestReduceAndBackfill(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        self.t = np.arange(1992., 2010., 1. / 12)
+        self.dmdt = -80. + rng.randn(self.t.size) * 10.
+        self.errs = np.abs(rng.randn(self.t.size)) * 5. + 5.
+
+    def _series(self, t: np.ndarray, dmdt: np.ndarray, errs: np.ndarray) -> WorkingMassRateDataSeries:
+        return WorkingMassRateDataSeries(
+            "user", "IOM", "IOM", BasinGroup.sheets, IceSheet.eais, 1., t, None, dmdt, errs
+        )
+
+    def assertSeriesEqual(self, actual: WorkingMassRateDataSeries, expected: WorkingMassRateDataSeries):
+        np.testing.assert_array_equal(actual.t, expected.t)
+        np.testing.assert_array_equal(actual.dmdt, expected.dmdt)
+        np.testing.assert_array_equal(actual.errs, expected.errs)
+
+    def _check(self, series: WorkingMassRateDataSeries, **kwargs):
+        # windows without any finite values give 'mean of empty slice' warnings
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            reduced, backfilled = series.reduce_and_backfill(**kwargs)
+
+            self.assertSeriesEqual(reduced, series.reduce(backfill=False, **kwargs))
+            self.assertSeriesEqual(backfilled, series.reduce(backfill=True, **kwargs))
+
+    def test_matches_reduce(self):
+        series = self._series(self.t, self.dmdt, self.errs)
+        for centre in (None, .495):
+            self._check(series, interval=1., centre=centre)
+        self._check(series, interval=1., centre=.495, interp=True)
+
+    def test_nan_values(self):
+        # NaN dM/dt values break the series into separate runs
+        self.dmdt[[0, 30, 31, 100]] = np.nan
+        self.errs[[50]] = np.nan
+        series = self._series(self.t, self.dmdt, self.errs)
+        for centre in (None, .495):
+            self._check(series, interval=1., centre=centre)
+
+    def test_empty_windows(self):
+        # a gap in the time-values leaves some windows without any values
+        keep = (self.t < 1996.) | (self.t >= 1999.)
+        series = self._series(self.t[keep], self.dmdt[keep], self.errs[keep])
+        self._check(series, interval=1., centre=.495)
+
+    def test_no_reduction(self):
+        # the series is already coarser than the interval
+        t = np.arange(1992., 2010., 2.)
+        series = self._series(t, self.dmdt[:t.size], self.errs[:t.size])
+        self._check(series, interval=1.)
+
+    def test_empty(self):
+        series = self._series(self.t[:0], self.dmdt[:0], self.errs[:0])
+        reduced, backfilled = series.reduce_and_backfill(interval=1.)
+        self.assertEqual(len(reduced), 0)
+        self.assertEqual(len(backfilled), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()